@@ -0,0 +1,44 @@
+"""add partial index for the raw_value copying audit
+
+Revision ID: 003_cell_formula_calc_index
+Revises: 002_job_tracking
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_cell_formula_calc_index'
+down_revision = '002_job_tracking'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create a partial index covering evaluated formula cells.
+    
+    The predicate matches the audit query in validate_no_copying.py
+    exactly, and the included value columns let Postgres answer it with
+    an index-only scan. Built concurrently so the cell table stays
+    writable on large databases.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_cell_formula_calc', 'cell', ['model_id'],
+            postgresql_where=sa.text('formula IS NOT NULL AND calculated_value IS NOT NULL'),
+            postgresql_include=['calculated_value', 'raw_value'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """
+    Remove the audit index.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_cell_formula_calc', table_name='cell',
+            postgresql_concurrently=True
+        )
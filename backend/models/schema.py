@@ -111,6 +111,9 @@ class Cell(Base):
         Index('idx_cell_formula', 'model_id', postgresql_where=text('formula IS NOT NULL')),
         Index('idx_cell_null_calculated', 'model_id', 
               postgresql_where=text('calculated_value IS NULL AND formula IS NOT NULL')),
+        Index('idx_cell_formula_calc', 'model_id',
+              postgresql_where=text('formula IS NOT NULL AND calculated_value IS NOT NULL'),
+              postgresql_include=['calculated_value', 'raw_value']),
         {'comment': 'Represents a single cell from an Excel worksheet'}
     )
     
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from openpyxl.utils import column_index_from_string
 from dotenv import load_dotenv
 from services.excel_import_service import ExcelImportService
 
@@ -44,6 +45,7 @@ def debug_formula_context(model_id: int = 5, target_cell: str = "F7"):
             cell_data = {
                 'sheet_name': row.sheet_name,
                 'cell': row.cell,
+                'coordinates': (row.row_num - 1, column_index_from_string(row.col_letter) - 1),
                 'row_num': row.row_num,
                 'col_letter': row.col_letter,
                 'cell_type': row.cell_type,
@@ -12,19 +12,24 @@ from typing import Dict, List
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, update, values, column, cast, func, Float, Numeric, String, Boolean
 from sqlalchemy.orm import sessionmaker
+from openpyxl.utils import column_index_from_string
 from dotenv import load_dotenv
 import logging
 
 from services.excel_import_service import ExcelImportService
 from services.formula_service import FormulaParser
+from backend.models.schema import Cell
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Mismatch tolerance between evaluated and Excel-cached values
+TOLERANCE = 1e-6
+
 
 def get_database_url() -> str:
     """Get database URL from environment."""
@@ -44,56 +49,58 @@ def fix_circular_cells(model_id: int = 1, dry_run: bool = True):
     session = Session()
     
     try:
-        # Get all cells for this model to build complete context
+        # Get all cells for this model to build complete context.
+        # raw_value is cast server-side so the driver returns native floats
+        # instead of Decimal, and NULL defaults are filled in by Postgres,
+        # so rows can be used as-is without per-row conversion. No ORDER BY:
+        # everything downstream is keyed by sheet/cell, so the server-side
+        # sort would be wasted work.
         logger.info(f"Loading all cells for model {model_id}...")
         query = text("""
             SELECT 
                 sheet_name, cell, row_num, col_letter, cell_type,
-                raw_value, raw_text, formula, data_type, depends_on,
-                is_circular, calculation_engine
+                raw_value::double precision AS raw_value,
+                raw_text, formula, data_type,
+                COALESCE(depends_on, '[]'::jsonb) AS depends_on,
+                COALESCE(is_circular, false) AS is_circular,
+                calculation_engine, calculated_value
             FROM cell
             WHERE model_id = :model_id
-            ORDER BY sheet_name, row_num, col_letter
         """)
         
         all_cells = session.execute(query, {'model_id': model_id}).fetchall()
         logger.info(f"Loaded {len(all_cells)} cells")
         
-        # Convert to cell data format expected by ExcelImportService
+        # Convert to cell data format expected by ExcelImportService.
+        # Sheet names, column letters and cell types repeat across every
+        # row, so intern them to share one string object per value.
         cells_data = []
         for row in all_cells:
             cell_data = {
-                'sheet_name': row.sheet_name,
+                'sheet_name': sys.intern(row.sheet_name),
                 'cell': row.cell,
+                'ref': f"{row.sheet_name}!{row.cell}",
+                'coordinates': (row.row_num - 1, column_index_from_string(row.col_letter) - 1),
                 'row_num': row.row_num,
-                'col_letter': row.col_letter,
-                'cell_type': row.cell_type,
-                'raw_value': float(row.raw_value) if row.raw_value else None,
+                'col_letter': sys.intern(row.col_letter),
+                'cell_type': sys.intern(row.cell_type) if row.cell_type else row.cell_type,
+                'raw_value': row.raw_value,
                 'raw_text': row.raw_text,
                 'formula': row.formula,
                 'data_type': row.data_type,
-                'depends_on': row.depends_on or [],
-                'is_circular': row.is_circular or False
+                'depends_on': row.depends_on,
+                'is_circular': row.is_circular
             }
             cells_data.append(cell_data)
         
-        # Get circular cells with zero calculated values
-        circular_zero_query = text("""
-            SELECT 
-                sheet_name, cell, row_num, col_letter, cell_type,
-                raw_value, formula, depends_on
-            FROM cell
-            WHERE model_id = :model_id
-                AND is_circular = true
-                AND (calculated_value = 0 OR calculated_value IS NULL)
-                AND formula IS NOT NULL
-            ORDER BY sheet_name, row_num, col_letter
-        """)
-        
-        circular_cells_to_fix = session.execute(
-            circular_zero_query, 
-            {'model_id': model_id}
-        ).fetchall()
+        # Circular cells with zero/NULL calculated values are a subset of the
+        # rows already loaded, so filter them here instead of re-querying
+        circular_cells_to_fix = [
+            row for row in all_cells
+            if row.is_circular
+            and row.formula is not None
+            and (row.calculated_value is None or row.calculated_value == 0)
+        ]
         
         logger.info(f"Found {len(circular_cells_to_fix)} circular cells to fix")
         
@@ -104,7 +111,11 @@ def fix_circular_cells(model_id: int = 1, dry_run: bool = True):
         if dry_run:
             logger.info("\nDRY RUN - Would fix the following cells:")
             logger.info("-" * 80)
-            for row in circular_cells_to_fix[:10]:
+            preview = sorted(
+                circular_cells_to_fix,
+                key=lambda r: (r.sheet_name, r.row_num, r.col_letter)
+            )[:10]
+            for row in preview:
                 logger.info(f"  {row.sheet_name}!{row.cell}: {row.formula[:60]}")
                 logger.info(f"    Raw value: {row.raw_value}")
             if len(circular_cells_to_fix) > 10:
@@ -125,8 +136,7 @@ def fix_circular_cells(model_id: int = 1, dry_run: bool = True):
         # Build cell lookup
         cell_lookup = {}
         for cell in cells_data:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
-            cell_lookup[cell_ref] = cell
+            cell_lookup[cell['ref']] = cell
         
         # Evaluate circular cells
         logger.info(f"Evaluating {len(circular_cells)} circular formulas...")
@@ -137,51 +147,63 @@ def fix_circular_cells(model_id: int = 1, dry_run: bool = True):
             cell_lookup,
             cache
         )
+        import_service.close()
         
-        # Update database with new calculated values
+        # Collect the new values, then work out mismatch flags here so the
+        # UPDATE only writes constants
         logger.info("Updating database...")
-        updated_count = 0
+        updates = []
         
         for cell in circular_cells:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+            cell_ref = cell['ref']
             if cell_ref in cache or cell.get('calculated_value') is not None:
                 calculated_value = cache.get(cell_ref) or cell.get('calculated_value')
                 
                 # Only update if we have a non-zero value
                 if calculated_value is not None and calculated_value != 0:
-                    update_query = text("""
-                        UPDATE cell
-                        SET 
-                            calculated_value = :calculated_value,
-                            has_mismatch = CASE
-                                WHEN raw_value IS NOT NULL AND 
-                                     ABS(:calculated_value - raw_value) > :tolerance
-                                THEN true
-                                ELSE false
-                            END,
-                            mismatch_diff = CASE
-                                WHEN raw_value IS NOT NULL
-                                THEN ABS(:calculated_value - raw_value)
-                                ELSE NULL
-                            END,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE model_id = :model_id
-                            AND sheet_name = :sheet_name
-                            AND cell = :cell
-                    """)
-                    
-                    session.execute(update_query, {
-                        'model_id': model_id,
-                        'sheet_name': cell['sheet_name'],
-                        'cell': cell['cell'],
-                        'calculated_value': calculated_value,
-                        'tolerance': 1e-6
-                    })
-                    updated_count += 1
+                    raw_value = cell.get('raw_value')
+                    diff = abs(calculated_value - raw_value) if raw_value is not None else None
+                    updates.append((
+                        cell['sheet_name'],
+                        cell['cell'],
+                        calculated_value,
+                        diff is not None and diff > TOLERANCE,
+                        diff
+                    ))
                     
                     logger.debug(f"Updated {cell['sheet_name']}!{cell['cell']}: "
                                f"{calculated_value:.2f} (raw: {cell.get('raw_value', 'N/A')})")
         
+        # Apply all rows in one UPDATE ... FROM (VALUES ...) statement
+        if updates:
+            cell_table = Cell.__table__
+            new_values = values(
+                column('sheet_name', String),
+                column('cell', String),
+                column('calculated_value', Float),
+                column('has_mismatch', Boolean),
+                column('mismatch_diff', Float),
+                name='v'
+            ).data(updates)
+            
+            update_stmt = (
+                update(cell_table)
+                .where(
+                    cell_table.c.model_id == model_id,
+                    cell_table.c.sheet_name == new_values.c.sheet_name,
+                    cell_table.c.cell == new_values.c.cell
+                )
+                .values(
+                    calculated_value=new_values.c.calculated_value,
+                    has_mismatch=new_values.c.has_mismatch,
+                    # An all-NULL VALUES column is typed as text by Postgres
+                    mismatch_diff=cast(new_values.c.mismatch_diff, Numeric(20, 10)),
+                    updated_at=func.current_timestamp()
+                )
+            )
+            session.execute(update_stmt)
+        updated_count = len(updates)
+        
         session.commit()
         logger.info(f"Successfully updated {updated_count} cells")
         
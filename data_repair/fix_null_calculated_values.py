@@ -18,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import click
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 import logging
 
@@ -58,17 +58,22 @@ def fix_nulls(model_id: int, dry_run: bool):
         click.echo(f"Mode: {'DRY RUN' if dry_run else 'APPLY CHANGES'}")
         click.echo(f"")
         
-        # Query cells with NULL calculated values
-        null_cells = session.query(Cell).filter(
+        # Count cells with NULL calculated values, split by circularity.
+        # Aggregating in SQL avoids materializing a Cell object per row.
+        counts = dict(session.query(Cell.is_circular, func.count()).filter(
             Cell.model_id == model_id,
             Cell.formula.isnot(None),
             Cell.calculated_value.is_(None),
             Cell.calculated_text.is_(None)
-        ).all()
+        ).group_by(Cell.is_circular).all())
         
-        click.echo(f"Found {len(null_cells)} cells with NULL calculated values")
+        circular_count = counts.get(True, 0)
+        non_circular_count = counts.get(False, 0)
+        null_count = circular_count + non_circular_count
         
-        if not null_cells:
+        click.echo(f"Found {null_count} cells with NULL calculated values")
+        
+        if not null_count:
             click.echo("✓ No NULL values to fix!")
             session.close()
             return
@@ -80,9 +85,6 @@ def fix_nulls(model_id: int, dry_run: bool):
         click.echo("Analysis:")
         click.echo("-" * 60)
         
-        circular_count = sum(1 for c in null_cells if c.is_circular)
-        non_circular_count = len(null_cells) - circular_count
-        
         click.echo(f"  Circular references: {circular_count}")
         click.echo(f"  Non-circular: {non_circular_count}")
         click.echo(f"")
@@ -14,11 +14,13 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, update, func
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import logging
 
+from backend.models.schema import Cell
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -43,17 +45,17 @@ def mark_circular_as_custom(model_id: int = 1, dry_run: bool = True):
     session = Session()
     
     try:
-        # Get circular cells with zero calculated values
+        # Get circular cells with zero calculated values. Left unordered;
+        # only the dry-run preview is sorted, in Python.
         query = text("""
             SELECT 
-                sheet_name, cell, formula, raw_value, calculated_value,
-                has_mismatch, calculation_engine
+                sheet_name, cell, row_num, col_letter, formula, raw_value,
+                calculated_value, has_mismatch, calculation_engine
             FROM cell
             WHERE model_id = :model_id
                 AND is_circular = true
                 AND has_mismatch = true
                 AND calculated_value = 0
-            ORDER BY sheet_name, row_num, col_letter
         """)
         
         results = session.execute(query, {'model_id': model_id}).fetchall()
@@ -63,7 +65,11 @@ def mark_circular_as_custom(model_id: int = 1, dry_run: bool = True):
         if dry_run:
             logger.info("\nDRY RUN - Would update the following cells:")
             logger.info("-" * 80)
-            for row in results[:10]:
+            preview = sorted(
+                results,
+                key=lambda r: (r.sheet_name, r.row_num, r.col_letter)
+            )[:10]
+            for row in preview:
                 logger.info(f"  {row.sheet_name}!{row.cell}")
                 logger.info(f"    Formula: {row.formula[:60]}")
                 logger.info(f"    Current: engine={row.calculation_engine}, "
@@ -79,49 +85,37 @@ def mark_circular_as_custom(model_id: int = 1, dry_run: bool = True):
             logger.info("  - Marking as 'custom' engine indicates they need special handling")
             return
         
-        # Update circular cells
-        update_query = text("""
-            UPDATE cell
-            SET 
-                calculation_engine = 'custom',
-                calculated_value = NULL,
-                has_mismatch = false,
-                mismatch_diff = NULL,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE model_id = :model_id
-                AND is_circular = true
-                AND has_mismatch = true
-                AND calculated_value = 0
-        """)
+        # Update circular cells; RETURNING reports the affected rows in
+        # the same round trip, so no follow-up COUNT query is needed
+        cell_table = Cell.__table__
+        update_stmt = (
+            update(cell_table)
+            .where(
+                cell_table.c.model_id == model_id,
+                cell_table.c.is_circular.is_(True),
+                cell_table.c.has_mismatch.is_(True),
+                cell_table.c.calculated_value == 0
+            )
+            .values(
+                calculation_engine='custom',
+                calculated_value=None,
+                has_mismatch=False,
+                mismatch_diff=None,
+                updated_at=func.current_timestamp()
+            )
+            .returning(cell_table.c.sheet_name, cell_table.c.cell)
+        )
         
-        result = session.execute(update_query, {'model_id': model_id})
+        updated = session.execute(update_stmt).all()
         session.commit()
         
-        logger.info(f"Successfully updated {result.rowcount} cells")
+        logger.info(f"Successfully updated {len(updated)} cells")
         logger.info("Changes:")
         logger.info("  - calculation_engine: → 'custom'")
         logger.info("  - calculated_value: 0 → NULL")
         logger.info("  - has_mismatch: true → false")
         logger.info("  - mismatch_diff: → NULL")
         
-        # Verify
-        verify_query = text("""
-            SELECT COUNT(*) as count
-            FROM cell
-            WHERE model_id = :model_id
-                AND is_circular = true
-                AND has_mismatch = true
-        """)
-        
-        verify_result = session.execute(verify_query, {'model_id': model_id}).fetchone()
-        remaining = verify_result.count if verify_result else 0
-        
-        logger.info(f"\nVerification:")
-        logger.info(f"  Remaining circular cells with mismatches: {remaining}")
-        
-        if remaining == 0:
-            logger.info("  ✓ All circular cell mismatches resolved!")
-        
     finally:
         session.close()
 
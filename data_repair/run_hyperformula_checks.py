@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Run the HyperFormula diagnostic checks concurrently.
+
+Each check spawns its own Node.js process, so running them together
+overlaps subprocess startup and JSON handling instead of waiting on
+each one in turn.
+
+Usage:
+    python data_repair/run_hyperformula_checks.py
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_repair.test_hyperformula_circular import check_simple_circular
+from data_repair.test_text_value_evaluation import check_text_value_in_formula
+
+
+async def run_all():
+    """Dispatch all HyperFormula checks at once and wait for them to finish."""
+    await asyncio.gather(
+        check_simple_circular(),
+        check_text_value_in_formula()
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(run_all())
@@ -46,6 +46,7 @@ def test_real_scenario():
             cell_data = {
                 'sheet_name': row.sheet_name,
                 'cell': row.cell,
+                'coordinates': FormulaParser.cell_to_coordinates(row.cell),
                 'cell_type': row.cell_type,
                 'raw_value': float(row.raw_value) if row.raw_value else None,
                 'raw_text': row.raw_text,
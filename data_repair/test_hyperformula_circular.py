@@ -3,14 +3,17 @@
 Test HyperFormula with a simple circular reference example.
 """
 
+import asyncio
 import json
 import subprocess
 import sys
 import os
 
+import orjson
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def test_simple_circular():
+async def check_simple_circular():
     """Test HyperFormula with a simple circular reference: A1=B1+1, B1=A1+1"""
     
     # Simple circular reference
@@ -35,24 +38,31 @@ def test_simple_circular():
     print("\n" + "="*80 + "\n")
     
     # Call HyperFormula
-    process = subprocess.Popen(
-        ['node', 'scripts/hyperformula_wrapper.js'],
+    process = await asyncio.create_subprocess_exec(
+        'node', 'scripts/hyperformula_wrapper.js',
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        stderr=subprocess.PIPE
     )
     
-    stdout, stderr = process.communicate(json.dumps(request), timeout=10)
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(orjson.dumps(request)),
+            timeout=10
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
     
     print("STDOUT:")
-    print(stdout)
+    print(stdout.decode())
     print("\nSTDERR:")
-    print(stderr)
+    print(stderr.decode())
     print("\nReturn code:", process.returncode)
     
     if process.returncode == 0:
-        result = json.loads(stdout)
+        result = orjson.loads(stdout)
         print("\nParsed result:")
         print(json.dumps(result, indent=2))
         
@@ -60,5 +70,10 @@ def test_simple_circular():
             print(f"\n{res['cell']}: {res['value']} (type: {res['type']})")
 
 
+def test_simple_circular():
+    """Synchronous entry point for pytest and direct execution."""
+    asyncio.run(check_simple_circular())
+
+
 if __name__ == '__main__':
     test_simple_circular()
\ No newline at end of file
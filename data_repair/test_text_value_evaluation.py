@@ -3,14 +3,17 @@
 Test if text values are being included in HyperFormula evaluation.
 """
 
+import asyncio
 import json
 import subprocess
 import sys
 import os
 
+import orjson
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def test_text_value_in_formula():
+async def check_text_value_in_formula():
     """Test if HyperFormula can evaluate formulas with text value dependencies."""
     
     # Simulate the actual data structure
@@ -39,25 +42,32 @@ def test_text_value_in_formula():
     print("\n" + "="*80 + "\n")
     
     # Call HyperFormula
-    process = subprocess.Popen(
-        ['node', 'scripts/hyperformula_wrapper.js'],
+    process = await asyncio.create_subprocess_exec(
+        'node', 'scripts/hyperformula_wrapper.js',
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        stderr=subprocess.PIPE
     )
     
-    stdout, stderr = process.communicate(json.dumps(request), timeout=10)
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(orjson.dumps(request)),
+            timeout=10
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
     
     print("STDOUT:")
-    print(stdout)
+    print(stdout.decode())
     if stderr:
         print("\nSTDERR:")
-        print(stderr)
+        print(stderr.decode())
     print("\nReturn code:", process.returncode)
     
     if process.returncode == 0:
-        result = json.loads(stdout)
+        result = orjson.loads(stdout)
         print("\nParsed result:")
         print(json.dumps(result, indent=2))
         
@@ -74,5 +84,10 @@ def test_text_value_in_formula():
                     print(f"  ERROR: Got type '{res['type']}' instead of 'number'")
 
 
+def test_text_value_in_formula():
+    """Synchronous entry point for pytest and direct execution."""
+    asyncio.run(check_text_value_in_formula())
+
+
 if __name__ == '__main__':
     test_text_value_in_formula()
\ No newline at end of file
@@ -22,6 +22,9 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cells removed per DELETE/commit when deleting a model
+CELL_DELETE_BATCH_SIZE = 50000
+
 
 def get_database_url() -> str:
     """Get database URL from environment."""
@@ -54,14 +57,11 @@ def delete_model(model_id: int, confirm: bool = False):
             logger.error(f"Model {model_id} not found")
             return
         
-        # Get cell count
-        cell_count_query = text("""
-            SELECT COUNT(*) as count
-            FROM cell
-            WHERE model_id = :model_id
-        """)
-        
-        cell_count = session.execute(cell_count_query, {'model_id': model_id}).fetchone().count
+        # Get cell count straight from the driver; it's a single integer
+        cell_count = session.connection().exec_driver_sql(
+            "SELECT COUNT(*) FROM cell WHERE model_id = %(model_id)s",
+            {'model_id': model_id}
+        ).scalar()
         
         # Display info
         logger.info("Model to be deleted:")
@@ -78,7 +78,33 @@ def delete_model(model_id: int, confirm: bool = False):
                 logger.info("Deletion cancelled")
                 return
         
-        # Delete model (cascade will delete cells automatically)
+        # Delete cells in bounded batches first, committing each one, so a
+        # large model doesn't turn into one huge cascading DELETE
+        logger.info(f"Deleting {cell_count} cells for model {model_id}...")
+        
+        cell_delete_query = text("""
+            DELETE FROM cell
+            WHERE model_id = :model_id
+                AND ctid IN (
+                    SELECT ctid FROM cell
+                    WHERE model_id = :model_id
+                    LIMIT :batch_size
+                )
+        """)
+        
+        deleted = 0
+        while True:
+            result = session.execute(cell_delete_query, {
+                'model_id': model_id,
+                'batch_size': CELL_DELETE_BATCH_SIZE
+            })
+            session.commit()
+            deleted += result.rowcount
+            logger.info(f"  Deleted {deleted}/{cell_count} cells")
+            if result.rowcount < CELL_DELETE_BATCH_SIZE:
+                break
+        
+        # Delete model (no cells left for the cascade to remove)
         logger.info(f"Deleting model {model_id}...")
         
         delete_query = text("""
@@ -99,25 +125,38 @@ def delete_model(model_id: int, confirm: bool = False):
         session.close()
 
 
-def list_models():
-    """List all models in the database."""
+def list_models(exact_counts: bool = False):
+    """
+    List all models in the database.
+    
+    Args:
+        exact_counts: If True, also count each model's cells. This scans
+            the whole cell table, so it is off by default.
+    """
     engine = create_engine(get_database_url())
     Session = sessionmaker(bind=engine)
     session = Session()
     
     try:
-        query = text("""
-            SELECT 
-                m.id,
-                m.name,
-                m.original_filename,
-                m.uploaded_at,
-                COUNT(c.model_id) as cell_count
-            FROM models m
-            LEFT JOIN cell c ON m.id = c.model_id
-            GROUP BY m.id, m.name, m.original_filename, m.uploaded_at
-            ORDER BY m.id
-        """)
+        if exact_counts:
+            query = text("""
+                SELECT 
+                    m.id,
+                    m.name,
+                    m.original_filename,
+                    m.uploaded_at,
+                    COUNT(c.model_id) as cell_count
+                FROM models m
+                LEFT JOIN cell c ON m.id = c.model_id
+                GROUP BY m.id, m.name, m.original_filename, m.uploaded_at
+                ORDER BY m.id
+            """)
+        else:
+            query = text("""
+                SELECT id, name, original_filename, uploaded_at
+                FROM models
+                ORDER BY id
+            """)
         
         models = session.execute(query).fetchall()
         
@@ -125,14 +164,18 @@ def list_models():
             logger.info("No models found in database")
             return
         
-        logger.info(f"Found {len(models)} model(s):")
-        logger.info("-" * 100)
-        
+        # Format every row up front and emit the listing as one record
+        lines = [f"Found {len(models)} model(s):", "-" * 100]
         for model in models:
-            logger.info(f"ID: {model.id:3d} | Name: {model.name:30s} | "
-                       f"File: {model.original_filename:30s} | "
-                       f"Cells: {model.cell_count:6d} | "
-                       f"Uploaded: {model.uploaded_at}")
+            cells = f"Cells: {model.cell_count:6d} | " if exact_counts else ""
+            lines.append(f"ID: {model.id:3d} | Name: {model.name:30s} | "
+                         f"File: {model.original_filename:30s} | "
+                         f"{cells}"
+                         f"Uploaded: {model.uploaded_at}")
+        logger.info("\n".join(lines))
+        
+        if not exact_counts:
+            logger.info("Use --exact-counts to include cell counts")
         
     finally:
         session.close()
@@ -156,6 +199,11 @@ def main():
         action='store_true',
         help='List all models'
     )
+    parser.add_argument(
+        '--exact-counts',
+        action='store_true',
+        help='Include per-model cell counts in --list (scans the cell table)'
+    )
     parser.add_argument(
         '--yes',
         action='store_true',
@@ -165,7 +213,7 @@ def main():
     args = parser.parse_args()
     
     if args.list:
-        list_models()
+        list_models(exact_counts=args.exact_counts)
     elif args.model_id:
         delete_model(args.model_id, confirm=args.yes)
     else:
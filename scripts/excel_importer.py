@@ -39,15 +39,10 @@ from typing import Optional
 
 import click
 from dotenv import load_dotenv
-import requests
-from websocket import create_connection, WebSocketException
 
-# For direct mode
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from backend.models.schema import Base
-from services.excel_import_service import ExcelImportService
-from services.validation_service import ValidationService
+# Mode-specific dependencies (SQLAlchemy and the services for direct mode,
+# requests/websocket for API mode) are imported inside the functions that
+# use them, so --help and the other mode don't pay for loading them.
 
 # Load environment variables
 load_dotenv()
@@ -125,13 +120,21 @@ def validate_cmd(model_id: int, api_url: Optional[str]):
 
 def import_direct(file_path: str, model_name: str, validate_flag: bool):
     """Import file using direct database access."""
+    from sqlalchemy import create_engine, inspect
+    from sqlalchemy.orm import sessionmaker
+    from backend.models.schema import Base
+    from services.excel_import_service import ExcelImportService
+    
     click.echo(f"\n📁 Importing: {file_path}")
     click.echo(f"📝 Model name: {model_name}")
     
     try:
         # Create database engine and session
         engine = create_engine(DATABASE_URL)
-        Base.metadata.create_all(engine)
+        # Only bootstrap the schema on a fresh database; create_all checks
+        # every table on every run otherwise
+        if not inspect(engine).has_table('models'):
+            Base.metadata.create_all(engine)
         Session = sessionmaker(bind=engine)
         session = Session()
         
@@ -191,6 +194,10 @@ def import_direct(file_path: str, model_name: str, validate_flag: bool):
 
 def validate_direct(model_id: int):
     """Validate model using direct database access."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from services.validation_service import ValidationService
+    
     click.echo(f"\n🔍 Validating Model #{model_id}...")
     
     try:
@@ -242,6 +249,8 @@ def validate_direct(model_id: int):
 
 def import_via_api(api_url: str, file_path: str, model_name: str, validate_flag: bool):
     """Import file via FastAPI backend."""
+    import requests
+    from websocket import WebSocketException
     
     click.echo(f"\n📤 Uploading {file_path} to {api_url}...")
     
@@ -293,6 +302,7 @@ def import_via_api(api_url: str, file_path: str, model_name: str, validate_flag:
 
 def track_progress_websocket(api_url: str, job_id: str, model_name: str):
     """Track import progress via WebSocket."""
+    from websocket import create_connection
     
     ws_url = api_url.replace('http://', 'ws://').replace('https://', 'wss://')
     ws_url = f"{ws_url}/ws/import/{job_id}"
@@ -367,6 +377,7 @@ def track_progress_websocket(api_url: str, job_id: str, model_name: str):
 
 def track_progress_polling(api_url: str, job_id: str, model_name: str):
     """Track import progress via REST API polling."""
+    import requests
     
     click.echo("⏱️  Polling for status updates...\n")
     
@@ -433,6 +444,8 @@ def track_progress_polling(api_url: str, job_id: str, model_name: str):
 
 def validate_via_api(api_url: str, model_id: int):
     """Validate model via FastAPI backend."""
+    import requests
+    from websocket import create_connection, WebSocketException
     
     click.echo(f"\n🔍 Triggering validation for Model #{model_id}...")
     
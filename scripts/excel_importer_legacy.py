@@ -20,22 +20,42 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import hashlib
 import logging
 import json
+import io
 import subprocess
+import select
+import struct
+import time
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, List, Optional, Tuple, Any, Set, Iterable
 from decimal import Decimal
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 import re
 
+# Use RE2 when available for formula scanning: a linear-time DFA rather
+# than a backtracking matcher. Its API is a drop-in replacement for the
+# subset used here.
+try:
+    import re2 as regex_engine
+except ImportError:
+    regex_engine = re
+
 import click
+import orjson
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, func
 from sqlalchemy.orm import sessionmaker, Session
 import openpyxl
+from openpyxl.cell.read_only import ReadOnlyCell
 from openpyxl.utils import get_column_letter, column_index_from_string
-from openpyxl.worksheet.datavalidation import DataValidation
-import networkx as nx
+from openpyxl.worksheet.datavalidation import DataValidation, DataValidationList
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.worksheet._reader import WorkSheetParser
+from openpyxl.xml.functions import iterparse
 
 # Import models
 from backend.models.schema import Base, Model, Cell
@@ -65,6 +85,150 @@ MAX_CIRCULAR_ITERATIONS = int(os.getenv('MAX_CIRCULAR_ITERATIONS', '100'))
 CONVERGENCE_THRESHOLD = float(os.getenv('CONVERGENCE_THRESHOLD', '1e-6'))
 MODELS_DIR = os.getenv('MODELS_DIR', 'models/')
 HYPERFORMULA_WRAPPER = os.getenv('HYPERFORMULA_WRAPPER', 'scripts/hyperformula_wrapper.js')
+FORMULA_CACHE_SIZE = int(os.getenv('FORMULA_CACHE_SIZE', '200000'))
+
+# Read size used when hashing uploaded workbooks
+HASH_BLOCK_SIZE = 1 << 20
+
+# Buckets for a numeric result-vs-raw_value comparison, and the stats
+# counter each one increments (COMPARISON_STATS is indexed by bucket)
+WITHIN_TOLERANCE = 0
+EXACT_MATCH = 1
+MISMATCH = 2
+COMPARISON_STATS = ('within_tolerance', 'exact_matches', 'mismatches')
+
+# Differences below this count as an exact match
+EXACT_MATCH_THRESHOLD = 1e-10
+
+# Added to |previous value| when scaling a change for the solver's relative
+# convergence test, so cells near zero fall back to the absolute test
+CONVERGENCE_SCALE_EPS = 1e-12
+
+# data_type stored for each exact Python type of a cached cell value. bool
+# is an int subclass and has always been stored as a number.
+VALUE_DATA_TYPES = {
+    int: 'number',
+    float: 'number',
+    bool: 'number',
+    str: 'text',
+    datetime: 'date',
+}
+
+# Length prefix on each HyperFormula worker message
+FRAME_HEADER = struct.Struct('<I')
+
+# Worksheet XML tags read directly when streaming sheets
+ROW_TAG = f'{{{SHEET_MAIN_NS}}}row'
+VALIDATION_TAG = f'{{{SHEET_MAIN_NS}}}dataValidations'
+
+
+# Cell columns loaded by COPY in bulk_insert_cells, in COPY order
+CELL_COPY_COLUMNS = [
+    'model_id', 'sheet_name', 'cell', 'row_num', 'col_letter', 'cell_type',
+    'raw_value', 'raw_text', 'formula', 'data_type', 'depends_on', 'is_circular',
+    'has_validation', 'validation_type', 'validation_options',
+    'style', 'calculation_engine', 'converted_formula',
+    'calculated_value', 'calculated_text', 'has_mismatch', 'mismatch_diff'
+]
+
+# COPY writes every column, so NOT NULL columns that cell dicts may omit
+# get their server defaults here
+CELL_COPY_DEFAULTS = {
+    'data_type': 'text',
+    'depends_on': [],
+    'is_circular': False,
+    'has_validation': False,
+    'validation_options': [],
+    'style': {},
+    'calculation_engine': 'none',
+    'has_mismatch': False
+}
+
+# (column, default) pairs for the cell dict fields, i.e. every COPY column
+# after model_id, and the COPY statement itself; both are fixed, so they
+# are built once here rather than per batch
+CELL_COPY_FIELDS = tuple((col, CELL_COPY_DEFAULTS.get(col)) for col in CELL_COPY_COLUMNS[1:])
+CELL_COPY_SQL = f"COPY cell ({', '.join(CELL_COPY_COLUMNS)}) FROM STDIN"
+
+
+def format_copy_field(value: Any) -> str:
+    """Format a value as a field in PostgreSQL's COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+# Functions HyperFormula can't evaluate; these need the custom engine.
+# Matched anywhere in the formula, case-insensitively, followed by '('.
+CUSTOM_FUNCTIONS = ['IRR', 'XIRR', 'XNPV', 'MIRR']
+
+# One pass over a formula finds text functions, custom-engine functions and
+# cell references. Function names are matched case-insensitively and must
+# be followed by '('.
+FORMULA_TOKEN_PATTERN = regex_engine.compile(
+    r'(?P<func>(?i:CONCATENATE|CONCAT|TEXT|CHAR|LOWER|UPPER|TRIM)\()'
+    r'|(?P<custom>(?i:' + '|'.join(CUSTOM_FUNCTIONS) + r')\()'
+    r'|(?:(?P<sheet>[A-Za-z0-9_]+)!)?(?P<cell>[A-Z]+\d+)'
+)
+STRING_LITERAL_FORMULA_PATTERN = regex_engine.compile(r'^="([^"]*)"$')
+
+
+def comparison_bucket(diff: float) -> int:
+    """
+    Classify |calculated - raw| as a comparison bucket.
+    
+    Returns MISMATCH beyond TOLERANCE, EXACT_MATCH below
+    EXACT_MATCH_THRESHOLD and WITHIN_TOLERANCE otherwise.
+    """
+    if diff > TOLERANCE:
+        return MISMATCH
+    elif diff < EXACT_MATCH_THRESHOLD:
+        return EXACT_MATCH
+    else:
+        return WITHIN_TOLERANCE
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _classify_formula(formula: str, current_sheet: str) -> Tuple[Tuple[str, ...], bool, str]:
+    """
+    Scan a formula once for its dependencies, whether it returns text and
+    which engine should calculate it.
+    
+    Cached because copied-down formulas repeat across many cells; the
+    cache size is capped by FORMULA_CACHE_SIZE.
+    
+    Returns:
+        (dependencies as "Sheet!Cell" references, is_text_formula,
+         'custom' or 'hyperformula')
+    """
+    if not formula or not formula.startswith('='):
+        return (), False, 'hyperformula'
+    
+    stripped = formula.strip()
+    # Empty string or string literal formula
+    is_text = stripped == '=""' or STRING_LITERAL_FORMULA_PATTERN.match(stripped) is not None
+    
+    engine = 'hyperformula'
+    dependencies = []
+    for match in FORMULA_TOKEN_PATTERN.finditer(formula):
+        if match.group('func'):
+            is_text = True
+            continue
+        if match.group('custom'):
+            engine = 'custom'
+            continue
+        sheet, cell = match.group('sheet', 'cell')
+        dependencies.append(f"{sheet or current_sheet}!{cell}")
+    
+    return tuple(dependencies), is_text, engine
 
 
 class FormulaParser:
@@ -73,6 +237,30 @@ class FormulaParser:
     # Regex to match cell references (e.g., A1, B24, Sheet1!A1)
     CELL_REF_PATTERN = re.compile(r'(?:([A-Za-z0-9_]+)!)?([A-Z]+\d+)')
     
+    @staticmethod
+    def _formula_text(formula) -> str:
+        """Convert openpyxl formula objects (e.g. ArrayFormula) to a string."""
+        if hasattr(formula, 'text'):
+            return formula.text
+        elif not isinstance(formula, str):
+            return str(formula)
+        return formula
+    
+    @staticmethod
+    def classify(formula: str, current_sheet: str) -> Tuple[List[str], bool, str]:
+        """
+        Extract dependencies, detect text formulas and pick the calculation
+        engine in a single pass.
+        
+        Returns:
+            (list of "Sheet!Cell" dependencies, True if formula returns text,
+             'custom' or 'hyperformula')
+        """
+        dependencies, is_text, engine = _classify_formula(
+            FormulaParser._formula_text(formula), current_sheet
+        )
+        return list(dependencies), is_text, engine
+    
     @staticmethod
     def extract_dependencies(formula: str, current_sheet: str) -> List[str]:
         """
@@ -80,68 +268,103 @@ class FormulaParser:
         
         Returns list of cell references in format "Sheet!Cell" or "Cell" for same sheet.
         """
-        # Convert to string if it's an openpyxl formula object
-        if hasattr(formula, 'text'):
-            formula = formula.text
-        elif not isinstance(formula, str):
-            formula = str(formula)
-        
-        if not formula or not formula.startswith('='):
-            return []
-        
-        dependencies = []
-        for match in FormulaParser.CELL_REF_PATTERN.finditer(formula):
-            sheet, cell = match.groups()
-            if sheet:
-                dependencies.append(f"{sheet}!{cell}")
-            else:
-                dependencies.append(f"{current_sheet}!{cell}")
-        
-        return dependencies
+        return FormulaParser.classify(formula, current_sheet)[0]
     
     @staticmethod
     def is_text_formula(formula: str) -> bool:
         """
         Detect if formula returns text (e.g., ="" or ="text").
         """
-        # Convert to string if it's an openpyxl formula object
-        if hasattr(formula, 'text'):
-            formula = formula.text
-        elif not isinstance(formula, str):
-            formula = str(formula)
-        
-        if not formula or not formula.startswith('='):
-            return False
-        
-        # Check for empty string formula
-        if formula.strip() == '=""':
-            return True
-        
-        # Check for string literal formula
-        if re.match(r'^="[^"]*"$', formula.strip()):
-            return True
-        
-        # Check for text functions
-        text_functions = ['CONCATENATE', 'CONCAT', 'TEXT', 'CHAR', 'LOWER', 'UPPER', 'TRIM']
-        for func in text_functions:
-            if func + '(' in formula.upper():
-                return True
-        
-        return False
+        # Text detection doesn't depend on the sheet
+        return _classify_formula(FormulaParser._formula_text(formula), '')[1]
 
 
 class CircularReferenceDetector:
     """Detect and analyze circular references in formulas."""
     
     def __init__(self):
-        self.graph = nx.DiGraph()
+        # Cells are interned to integer ids; adjacency[i] lists the ids
+        # cell i depends on
+        self._cell_ids: Dict[str, int] = {}
+        self._cells: List[str] = []
+        self._adjacency: List[List[int]] = []
         self.circular_groups: List[List[str]] = []
+        self._circular_set: Set[str] = set()
+    
+    def _cell_id(self, cell: str) -> int:
+        """Return the integer id for a cell, assigning one if new."""
+        cell_id = self._cell_ids.get(cell)
+        if cell_id is None:
+            cell_id = self._cell_ids[cell] = len(self._cells)
+            self._cells.append(cell)
+            self._adjacency.append([])
+        return cell_id
     
     def add_dependency(self, cell: str, depends_on: List[str]):
         """Add a cell and its dependencies to the graph."""
-        self.graph.add_node(cell)
+        edges = self._adjacency[self._cell_id(cell)]
         for dep in depends_on:
-            self.graph.add_edge(cell, dep)
+            edges.append(self._cell_id(dep))
+    
+    def _strongly_connected_components(self) -> List[List[int]]:
+        """
+        Iterative Tarjan over the integer adjacency lists.
+        
+        Avoids recursion limits on long dependency chains and the per-node
+        dict overhead of a general-purpose graph library.
+        """
+        adjacency = self._adjacency
+        n = len(adjacency)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+            
+            while work:
+                v, i = work[-1]
+                successors = adjacency[v]
+                if i < len(successors):
+                    work[-1] = (v, i + 1)
+                    w = successors[i]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+        
+        return components
     
     def detect_cycles(self) -> List[List[str]]:
         """
@@ -151,13 +374,18 @@ class CircularReferenceDetector:
         """
         try:
             # Find strongly connected components (cycles)
-            cycles = list(nx.strongly_connected_components(self.graph))
+            components = self._strongly_connected_components()
             # Filter out single nodes (not cycles)
-            self.circular_groups = [list(cycle) for cycle in cycles if len(cycle) > 1]
+            cells = self._cells
+            self.circular_groups = [
+                [cells[i] for i in component]
+                for component in components if len(component) > 1
+            ]
+            self._circular_set = set().union(*self.circular_groups)
             
             logger.info(f"Detected {len(self.circular_groups)} circular reference groups")
             for i, group in enumerate(self.circular_groups):
-                logger.debug(f"Circular group {i+1}: {group}")
+                logger.debug("Circular group %d: %s", i + 1, group)
             
             return self.circular_groups
         except Exception as e:
@@ -166,10 +394,7 @@ class CircularReferenceDetector:
     
     def is_circular(self, cell: str) -> bool:
         """Check if a cell is part of a circular reference."""
-        for group in self.circular_groups:
-            if cell in group:
-                return True
-        return False
+        return cell in self._circular_set
 
 
 class CircularSolver:
@@ -185,6 +410,10 @@ class CircularSolver:
         """
         Iteratively solve circular references.
         
+        A cell has converged once its change between iterations is below the
+        threshold either absolutely or relative to its magnitude, so large
+        values (e.g. 1e9) aren't iterated down to absolute noise.
+        
         CRITICAL: NEVER copies raw_value to calculated_value. Sets NULL on failure.
         
         Returns: (results_dict, status, iterations)
@@ -201,17 +430,25 @@ class CircularSolver:
             else:
                 values[cell_ref] = 0.0
         
-        converged_cells = set()
+        # Only cells that haven't converged are re-evaluated; converged cells
+        # simply keep their value
+        pending = list(circular_cells)
+        
+        # Checked once so the per-cell debug message isn't formatted when
+        # debug logging is off
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         for iteration in range(self.max_iterations):
-            new_values = {}
+            # Each sweep reads only the previous iteration's values (Jacobi),
+            # so results are collected and applied once the sweep is done.
+            # That costs O(pending) per iteration instead of copying every
+            # value.
+            updates = []
             max_change = 0.0
+            max_scaled_change = 0.0
+            still_pending = []
             
-            for cell_ref in circular_cells:
-                if cell_ref in converged_cells:
-                    new_values[cell_ref] = values[cell_ref]
-                    continue
-                
+            for cell_ref in pending:
                 try:
                     # Evaluate with current context
                     result = evaluate_func(cell_ref, values)
@@ -220,32 +457,44 @@ class CircularSolver:
                         # Failed to evaluate - set NULL, DO NOT copy raw_value
                         logger.error(f"Failed to evaluate circular cell {cell_ref} "
                                    f"(formula: {cell_data.get(cell_ref, {}).get('formula', 'N/A')})")
-                        new_values[cell_ref] = None
+                        updates.append((cell_ref, None))
+                        still_pending.append(cell_ref)
                         continue
                     
-                    new_values[cell_ref] = result
+                    updates.append((cell_ref, result))
                     
                     # Calculate change
-                    if isinstance(result, (int, float)) and isinstance(values[cell_ref], (int, float)):
-                        change = abs(result - values[cell_ref])
-                        max_change = max(max_change, change)
+                    previous = values[cell_ref]
+                    if isinstance(result, (int, float)) and isinstance(previous, (int, float)):
+                        change = abs(result - previous)
+                        if change > max_change:
+                            max_change = change
+                        scaled_change = change / (abs(previous) + CONVERGENCE_SCALE_EPS)
+                        if scaled_change > max_scaled_change:
+                            max_scaled_change = scaled_change
                         
                         # Mark as converged if within threshold
-                        if change < self.threshold:
-                            converged_cells.add(cell_ref)
-                            logger.debug(f"Cell {cell_ref} converged (change: {change:.2e})")
+                        if change < self.threshold or scaled_change < self.threshold:
+                            if debug:
+                                logger.debug("Cell %s converged (change: %.2e)", cell_ref, change)
+                            continue
                     
                 except Exception as e:
                     logger.error(f"Error evaluating circular cell {cell_ref}: {e}")
-                    new_values[cell_ref] = None
+                    updates.append((cell_ref, None))
+                
+                still_pending.append(cell_ref)
             
-            values = new_values
+            values.update(updates)
+            pending = still_pending
             
-            logger.debug(f"Iteration {iteration + 1}: max_change={max_change:.2e}, "
-                        f"converged={len(converged_cells)}/{len(circular_cells)}")
+            logger.debug("Iteration %d: max_change=%.2e, max_scaled_change=%.2e, converged=%d/%d",
+                         iteration + 1, max_change, max_scaled_change,
+                         len(circular_cells) - len(pending), len(circular_cells))
             
             # Check global convergence
-            if max_change < self.threshold or len(converged_cells) == len(circular_cells):
+            if (max_change < self.threshold or max_scaled_change < self.threshold
+                    or not pending):
                 logger.info(f"Converged after {iteration + 1} iterations")
                 return values, 'converged', iteration + 1
         
@@ -254,14 +503,78 @@ class CircularSolver:
 
 
 class HyperFormulaEvaluator:
-    """Interface to HyperFormula via Node.js subprocess."""
+    """
+    Interface to HyperFormula via a persistent Node.js worker.
     
-    def __init__(self, wrapper_path: str = HYPERFORMULA_WRAPPER):
+    The wrapper is started once in --worker mode and reused for every
+    batch, so Node start-up and the HyperFormula import are paid once per
+    importer rather than per batch. Requests and responses are orjson
+    documents framed by a 4-byte little-endian length (FRAME_HEADER).
+    """
+    
+    def __init__(self, wrapper_path: str = HYPERFORMULA_WRAPPER, timeout: float = 30):
         self.wrapper_path = wrapper_path
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
         
         if not Path(wrapper_path).exists():
             logger.warning(f"HyperFormula wrapper not found at {wrapper_path}")
     
+    def _ensure_worker(self) -> subprocess.Popen:
+        """Start the Node.js worker on first use, or restart it if it died."""
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                ['node', self.wrapper_path, '--worker'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        return self.process
+    
+    def _kill_worker(self):
+        """Terminate a worker that timed out or broke the protocol."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+    
+    @staticmethod
+    def _write_frame(process: subprocess.Popen, message: Dict):
+        """Send one length-prefixed JSON message to the worker."""
+        payload = orjson.dumps(message)
+        process.stdin.write(FRAME_HEADER.pack(len(payload)))
+        process.stdin.write(payload)
+        process.stdin.flush()
+    
+    @staticmethod
+    def _read_exact(fd: int, size: int, deadline: float) -> Optional[bytes]:
+        """
+        Read exactly size bytes from fd before deadline.
+        
+        Returns None if the worker closed its stdout first; raises
+        TimeoutError if the deadline passes.
+        """
+        data = bytearray()
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return bytes(data)
+    
+    def _read_frame(self, process: subprocess.Popen, deadline: float) -> Optional[bytes]:
+        """Read one length-prefixed response body from the worker."""
+        # Read straight from the pipe's fd; the buffered stdout object is
+        # never used, so select() always sees unread data
+        fd = process.stdout.fileno()
+        header = self._read_exact(fd, FRAME_HEADER.size, deadline)
+        if header is None:
+            return None
+        return self._read_exact(fd, FRAME_HEADER.unpack(header)[0], deadline)
+    
     def evaluate_batch(self, sheets_data: List[Dict], queries: List[Dict]) -> Dict:
         """
         Evaluate multiple formulas using HyperFormula.
@@ -279,31 +592,74 @@ class HyperFormulaEvaluator:
         }
         
         try:
-            # Call Node.js wrapper
-            process = subprocess.Popen(
-                ['node', self.wrapper_path],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate(json.dumps(request), timeout=30)
+            process = self._ensure_worker()
+            self._write_frame(process, request)
             
-            if process.returncode != 0:
-                logger.error(f"HyperFormula error (exit {process.returncode}): {stderr}")
-                return {'success': False, 'error': stderr}
+            response = self._read_frame(process, time.monotonic() + self.timeout)
+            if response is None:
+                returncode = process.wait()
+                self.process = None
+                logger.error(f"HyperFormula worker exited (exit {returncode})")
+                return {'success': False, 'error': f'Worker exited with code {returncode}'}
             
-            result = json.loads(stdout)
-            logger.debug(f"HyperFormula evaluated {len(queries)} queries")
+            result = orjson.loads(response)
+            logger.debug("HyperFormula evaluated %d queries", len(queries))
             return result
             
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             logger.error("HyperFormula evaluation timed out")
+            self._kill_worker()
             return {'success': False, 'error': 'Timeout'}
         except Exception as e:
             logger.error(f"HyperFormula evaluation failed: {e}")
+            self._kill_worker()
             return {'success': False, 'error': str(e)}
+    
+    def close(self):
+        """Ask the worker to exit and wait for it."""
+        if self.process is None:
+            return
+        
+        try:
+            if self.process.poll() is None:
+                self._write_frame(self.process, {'cmd': 'exit'})
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        finally:
+            self.process = None
+
+
+class FormulaValueSheetParser(WorkSheetParser):
+    """
+    Worksheet parser that returns each cell's formula and cached value.
+    
+    openpyxl keeps either the <f> formula or the cached <v> value of a cell
+    depending on data_only. Parsing the element both ways here gives the
+    pair from a single read of the sheet XML, instead of loading the whole
+    workbook twice.
+    """
+    
+    def parse_cell(self, element):
+        """Return (formula cell, value cell) dicts for a <c> element."""
+        col_counter = self.col_counter
+        formula_cell = super().parse_cell(element)
+        if formula_cell['data_type'] != 'f':
+            return formula_cell, formula_cell
+        
+        # Re-read with data_only to get Excel's computed value; restore the
+        # column counter so cells without an address aren't counted twice
+        next_col_counter = self.col_counter
+        self.col_counter = col_counter
+        self.data_only = True
+        try:
+            value_cell = super().parse_cell(element)
+        finally:
+            self.data_only = False
+            self.col_counter = next_col_counter
+        return formula_cell, value_cell
 
 
 class ExcelImporter:
@@ -316,6 +672,9 @@ class ExcelImporter:
         self.circular_detector = CircularReferenceDetector()
         self.circular_solver = CircularSolver()
         
+        # Decoded style dicts keyed by workbook style index
+        self._style_cache: Dict[int, Dict] = {}
+        
         # Statistics tracking
         self.stats = {
             'total_cells': 0,
@@ -334,12 +693,22 @@ class ExcelImporter:
             'dropdown_cells': []
         }
     
+    def close(self):
+        """Release external resources (the HyperFormula worker)."""
+        self.hf_evaluator.close()
+    
     def compute_file_hash(self, file_path: str) -> str:
-        """Compute SHA256 hash of file."""
+        """
+        Compute SHA256 hash of file.
+        
+        Reads into one reusable HASH_BLOCK_SIZE buffer, so large workbooks
+        hash with a few hundred reads and no per-block allocation.
+        """
         sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+        buffer = memoryview(bytearray(HASH_BLOCK_SIZE))
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buffer):
+                sha256_hash.update(buffer[:n])
         return sha256_hash.hexdigest()
     
     def check_duplicate(self, file_hash: str) -> Optional[int]:
@@ -369,71 +738,231 @@ class ExcelImporter:
         """
         Parse Excel workbook and extract all cell data.
         
+        Sheets are independent, so workbooks with several sheets are parsed
+        across a process pool, one sheet per task.
+        
         Returns dictionary with sheets and cells.
         """
         logger.info(f"Parsing workbook: {file_path}")
         
-        # Load twice: once for formulas, once for computed values
-        wb_formulas = openpyxl.load_workbook(file_path, data_only=False)
-        wb_values = openpyxl.load_workbook(file_path, data_only=True)
+        # Load once, read-only, so rows are streamed from the XML instead of
+        # building the full cell tree. Formulas and computed values both come
+        # from the same pass (see FormulaValueSheetParser).
+        wb = openpyxl.load_workbook(file_path, data_only=False, read_only=True, keep_links=False)
         
         workbook_data = {
             'sheets': [],
             'cells': []
         }
         
-        for sheet_name in wb_formulas.sheetnames:
-            ws_formulas = wb_formulas[sheet_name]
-            ws_values = wb_values[sheet_name]
-            logger.info(f"Processing sheet: {sheet_name}")
-            
-            sheet_info = {
-                'name': sheet_name,
-                'max_row': ws_formulas.max_row,
-                'max_column': ws_formulas.max_column
-            }
+        # Style indices are only meaningful within one workbook
+        self._style_cache.clear()
+        
+        try:
+            sheet_names = wb.sheetnames
+            if len(sheet_names) <= 1:
+                sheet_results = [self._parse_sheet(wb, sheet_name) for sheet_name in sheet_names]
+        finally:
+            wb.close()
+        
+        if len(sheet_names) > 1:
+            # Each worker loads the workbook once and parses whole sheets;
+            # map() keeps results in sheet order
+            with ProcessPoolExecutor(
+                max_workers=min(len(sheet_names), os.cpu_count() or 1),
+                initializer=init_sheet_worker,
+                initargs=(file_path,)
+            ) as executor:
+                sheet_results = list(executor.map(parse_sheet_in_worker, sheet_names))
+        
+        for sheet_info, cells, dropdown_cells in sheet_results:
             workbook_data['sheets'].append(sheet_info)
-            
-            # Extract data validations (dropdowns)
-            dropdown_cells = []
-            if hasattr(ws_formulas, 'data_validations'):
-                for dv in ws_formulas.data_validations.dataValidation:
-                    if dv.type == 'list':
-                        for cell_range in dv.cells:
-                            dropdown_cells.append(f"{sheet_name}!{cell_range}")
-            
-            if dropdown_cells:
-                self.stats['dropdown_cells'].extend(dropdown_cells)
-            
-            # Iterate through all cells in used range
-            for row_idx, row in enumerate(ws_formulas.iter_rows(min_row=1, max_row=ws_formulas.max_row,
-                                   min_col=1, max_col=ws_formulas.max_column), 1):
-                for cell in row:
-                    if cell.value is None and not cell.data_type == 'f':
+            workbook_data['cells'].extend(cells)
+            self.stats['dropdown_cells'].extend(dropdown_cells)
+        
+        # Tally cell types in one pass over the parsed cells rather than
+        # bumping counters per cell while parsing
+        type_counts = Counter(cell['cell_type'] for cell in workbook_data['cells'])
+        self.stats['total_cells'] += len(workbook_data['cells'])
+        self.stats['value_cells'] += type_counts['value']
+        self.stats['formula_cells'] += type_counts['formula']
+        self.stats['formula_text_cells'] += type_counts['formula_text']
+        
+        logger.info(f"Parsed {len(workbook_data['sheets'])} sheets, "
+                   f"{self.stats['total_cells']} cells")
+        
+        return workbook_data
+    
+    def _parse_sheet(self, wb, sheet_name: str) -> Tuple[Dict, List[Dict], List[str]]:
+        """
+        Parse one worksheet of a read-only workbook.
+        
+        Returns:
+            (sheet info, cell data dicts, dropdown cell ranges)
+        """
+        ws = wb[sheet_name]
+        logger.info(f"Processing sheet: {sheet_name}")
+        
+        # Every cell row carries the sheet name; intern it so they all share
+        # one string object
+        sheet_name = sys.intern(sheet_name)
+        
+        sheet_info = {
+            'name': sheet_name,
+            'max_row': ws.max_row,
+            'max_column': ws.max_column
+        }
+        cells = []
+        
+        # Extract data validations (dropdowns)
+        data_validations = self._read_data_validations(ws)
+        dropdown_cells = []
+        for dv in data_validations:
+            if dv.type == 'list':
+                for cell_range in dv.cells:
+                    dropdown_cells.append(f"{sheet_name}!{cell_range}")
+        
+        validation_map = self._build_validation_map(data_validations)
+        
+        # Each parsed cell yields its formula and Excel's cached value
+        with ws._get_source() as source:
+            parser = FormulaValueSheetParser(
+                source,
+                ws._shared_strings,
+                data_only=False,
+                epoch=wb.epoch,
+                date_formats=wb._date_formats,
+                timedelta_formats=wb._timedelta_formats
+            )
+            for _, row in parser.parse():
+                for formula_cell, value_cell in row:
+                    if formula_cell['value'] is None and not formula_cell['data_type'] == 'f':
                         continue  # Skip empty cells
                     
-                    # Get corresponding value cell
-                    value_cell = ws_values.cell(row=cell.row, column=cell.column)
+                    # Non-formula cells are their own cached value, so the
+                    # same cell object serves both roles
+                    cell = ReadOnlyCell(ws, **formula_cell)
+                    cached = cell if value_cell is formula_cell else ReadOnlyCell(ws, **value_cell)
                     
-                    cell_data = self.extract_cell_data(cell, value_cell, sheet_name, ws_formulas)
+                    cell_data = self.extract_cell_data(cell, cached, sheet_name, validation_map)
                     if cell_data:
-                        workbook_data['cells'].append(cell_data)
-                        self.stats['total_cells'] += 1
+                        cells.append(cell_data)
         
-        logger.info(f"Parsed {len(workbook_data['sheets'])} sheets, "
-                   f"{self.stats['total_cells']} cells")
+        return sheet_info, cells, dropdown_cells
+    
+    def _read_data_validations(self, worksheet) -> List[DataValidation]:
+        """
+        Read a sheet's data validations.
         
-        return workbook_data
+        Read-only worksheets don't parse validations, so stream the sheet
+        XML once more and pick out just the dataValidations element (it
+        follows sheetData, so rows are discarded as they go by).
+        """
+        with worksheet._get_source() as source:
+            for _, element in iterparse(source):
+                if element.tag == VALIDATION_TAG:
+                    return DataValidationList.from_tree(element).dataValidation
+                if element.tag == ROW_TAG:
+                    element.clear()
+        return []
     
-    def extract_cell_data(self, cell_formula, cell_value, sheet_name: str, worksheet) -> Optional[Dict]:
+    @staticmethod
+    def _build_validation_map(
+        data_validations: List[DataValidation]
+    ) -> Dict[int, List[Tuple[int, int, Tuple[str, List[str]]]]]:
+        """
+        Index data validations by column.
+        
+        Each validation's options are parsed once. Every column a range
+        covers gets the range's row bounds, so whole-column and whole-sheet
+        validations cost one entry per column rather than one per cell, and
+        nothing depends on the sheet's declared dimensions (read-only sheets
+        only know the <dimension> element, which may be stale or missing).
+        Ranges are kept in document order, so when validations overlap the
+        first one listed wins (see _lookup_validation).
+        
+        Returns:
+            Dict of column -> [(min row, max row, (validation type, options))]
+        """
+        validation_map = {}
+        for dv in data_validations:
+            validation_options = []
+            if dv.formula1:
+                # Try to extract list values
+                try:
+                    if dv.formula1.startswith('"'):
+                        # Quoted list: "Option1,Option2,Option3"
+                        options_str = dv.formula1.strip('"')
+                        validation_options = [opt.strip() for opt in options_str.split(',')]
+                    else:
+                        # Range reference
+                        validation_options = [dv.formula1]
+                except:
+                    pass
+            validation = (dv.type, validation_options)
+            
+            for cell_range in dv.sqref.ranges:
+                bounds = (cell_range.min_row, cell_range.max_row, validation)
+                for col in range(cell_range.min_col, cell_range.max_col + 1):
+                    validation_map.setdefault(col, []).append(bounds)
+        
+        return validation_map
+    
+    @staticmethod
+    def _lookup_validation(
+        validation_map: Dict[int, List[Tuple[int, int, Tuple[str, List[str]]]]],
+        row: int,
+        col: int
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Return the first validation covering (row, col), or None."""
+        for min_row, max_row, validation in validation_map.get(col, ()):
+            if min_row <= row <= max_row:
+                return validation
+        return None
+    
+    def _extract_style(self, cell, cell_address: str) -> Dict:
+        """
+        Decode the font, border and fill attributes stored for a cell.
+        
+        Called once per distinct style index; see extract_cell_data.
+        """
+        style = {}
+        if cell.font:
+            style['font_size'] = cell.font.size
+            style['bold'] = cell.font.bold
+            style['italic'] = cell.font.italic
+        if cell.border and cell.border.left:
+            style['border_style'] = cell.border.left.style
+        if cell.fill and cell.fill.start_color:
+            # Safely extract RGB color
+            try:
+                if hasattr(cell.fill.start_color, 'rgb'):
+                    rgb = cell.fill.start_color.rgb
+                    # Check if it's actually a string (not an error message or validation object)
+                    if isinstance(rgb, str) and not rgb.startswith('Values must be'):
+                        style['bg_color'] = rgb
+                    else:
+                        # Invalid or error value - skip it
+                        style['bg_color'] = None
+                else:
+                    style['bg_color'] = None
+            except Exception as e:
+                logger.debug("Could not extract bg_color for %s: %s", cell_address, e)
+                style['bg_color'] = None
+        
+        return style
+    
+    def extract_cell_data(self, cell_formula, cell_value, sheet_name: str,
+                          validation_map: Dict[int, List[Tuple[int, int, Tuple[str, List[str]]]]]) -> Optional[Dict]:
         """
         Extract all data from a single cell.
         
         Args:
-            cell_formula: Cell from workbook loaded with data_only=False (has formulas)
-            cell_value: Cell from workbook loaded with data_only=True (has computed values)
+            cell_formula: Cell holding the formula (data_only=False view)
+            cell_value: Same cell holding Excel's cached value (data_only=True view)
             sheet_name: Name of the worksheet
-            worksheet: Worksheet object for validation extraction
+            validation_map: Validation ranges by column, from
+                _build_validation_map
         """
         row_num = cell_formula.row
         col_letter = get_column_letter(cell_formula.column)
@@ -448,109 +977,73 @@ class ExcelImporter:
             elif cell_formula.value:
                 formula = str(cell_formula.value)
         
-        # Classify cell type
+        # Classify cell type, extract dependencies and pick the calculation
+        # engine in one pass, so evaluation doesn't rescan the formula
         cell_type = 'value'
+        depends_on = []
+        calculation_engine = 'none'
         if formula:
-            if self.parser.is_text_formula(formula):
-                cell_type = 'formula_text'
-                self.stats['formula_text_cells'] += 1
-            else:
-                cell_type = 'formula'
-                self.stats['formula_cells'] += 1
-        else:
-            self.stats['value_cells'] += 1
+            depends_on, is_text, calculation_engine = self.parser.classify(formula, sheet_name)
+            cell_type = 'formula_text' if is_text else 'formula'
         
-        # Get raw value from the data_only=True workbook (Excel's computed value)
+        # Get raw value from the cached value (Excel's computed value)
         raw_value = None
         raw_text = None
+        value = cell_value.value
         
-        if cell_value.value is not None:
+        # Infer data type from the computed value with one dict lookup on
+        # the exact type; subclasses fall back to isinstance checks
+        data_type = VALUE_DATA_TYPES.get(type(value))
+        if data_type is None:
+            data_type = 'text'
+            if isinstance(value, (int, float)):
+                data_type = 'number'
+            elif isinstance(value, datetime):
+                data_type = 'date'
+        
+        # raw_value is converted to float once here; evaluation and mismatch
+        # checks use it as-is
+        if value is not None:
             try:
                 # Try to convert to float
-                if isinstance(cell_value.value, (int, float)):
-                    raw_value = float(cell_value.value)
-                elif isinstance(cell_value.value, str):
+                if data_type == 'number':
+                    raw_value = float(value)
+                elif isinstance(value, str):
                     # Try to parse string as number
                     try:
-                        raw_value = float(cell_value.value)
+                        raw_value = float(value)
                     except ValueError:
                         # It's actually a text value - store in raw_text
-                        raw_text = cell_value.value
-                        logger.debug(f"Cell {cell_address} has text value: {raw_text}")
+                        raw_text = value
+                        logger.debug("Cell %s has text value: %s", cell_address, raw_text)
                 else:
-                    logger.debug(f"Cell {cell_address} has non-numeric value type: {type(cell_value.value)}")
+                    logger.debug("Cell %s has non-numeric value type: %s", cell_address, type(value))
             except (ValueError, TypeError) as e:
-                logger.debug(f"Could not convert value for {cell_address}: {e}")
-        
-        # Infer data type from the computed value
-        data_type = 'text'
-        if isinstance(cell_value.value, (int, float)):
-            data_type = 'number'
-        elif isinstance(cell_value.value, bool):
-            data_type = 'boolean'
-        elif isinstance(cell_value.value, datetime):
-            data_type = 'date'
-        elif isinstance(cell_value.value, str):
-            data_type = 'text'
-        
-        # Extract dependencies
-        depends_on = []
-        if formula:
-            depends_on = self.parser.extract_dependencies(formula, sheet_name)
+                logger.debug("Could not convert value for %s: %s", cell_address, e)
         
         # Check for validation
         has_validation = False
         validation_type = None
         validation_options = []
         
-        cell_coord = cell_formula.coordinate
-        if hasattr(worksheet, 'data_validations'):
-            for dv in worksheet.data_validations.dataValidation:
-                if cell_coord in dv.cells:
-                    has_validation = True
-                    validation_type = dv.type
-                    if dv.formula1:
-                        # Try to extract list values
-                        try:
-                            if dv.formula1.startswith('"'):
-                                # Quoted list: "Option1,Option2,Option3"
-                                options_str = dv.formula1.strip('"')
-                                validation_options = [opt.strip() for opt in options_str.split(',')]
-                            else:
-                                # Range reference
-                                validation_options = [dv.formula1]
-                        except:
-                            pass
-                    break
+        validation = self._lookup_validation(validation_map, row_num, cell_formula.column)
+        if validation is not None:
+            has_validation = True
+            validation_type, validation_options = validation
         
-        # Extract style information
-        style = {}
-        if cell_formula.font:
-            style['font_size'] = cell_formula.font.size
-            style['bold'] = cell_formula.font.bold
-            style['italic'] = cell_formula.font.italic
-        if cell_formula.border and cell_formula.border.left:
-            style['border_style'] = cell_formula.border.left.style
-        if cell_formula.fill and cell_formula.fill.start_color:
-            # Safely extract RGB color
-            try:
-                if hasattr(cell_formula.fill.start_color, 'rgb'):
-                    rgb = cell_formula.fill.start_color.rgb
-                    # Check if it's actually a string (not an error message or validation object)
-                    if isinstance(rgb, str) and not rgb.startswith('Values must be'):
-                        style['bg_color'] = rgb
-                    else:
-                        # Invalid or error value - skip it
-                        style['bg_color'] = None
-                else:
-                    style['bg_color'] = None
-            except Exception as e:
-                logger.debug(f"Could not extract bg_color for {cell_address}: {e}")
-                style['bg_color'] = None
+        # Cells sharing a style index share one decoded style dict
+        style_id = getattr(cell_formula, '_style_id', None)
+        style = self._style_cache.get(style_id) if style_id is not None else None
+        if style is None:
+            style = self._extract_style(cell_formula, cell_address)
+            if style_id is not None:
+                self._style_cache[style_id] = style
         
         cell_data = {
             'sheet_name': sheet_name,
             'cell': cell_address,
+            # "Sheet!Cell" key used by the dependency graph and solver
+            'cell_ref': f"{sheet_name}!{cell_address}",
             'row_num': row_num,
             'col_letter': col_letter,
             'cell_type': cell_type,
@@ -559,6 +1052,7 @@ class ExcelImporter:
             'formula': formula,
             'data_type': data_type,
             'depends_on': depends_on,
+            'calculation_engine': calculation_engine,
             'has_validation': has_validation,
             'validation_type': validation_type,
             'validation_options': validation_options,
@@ -599,16 +1093,14 @@ class ExcelImporter:
         # Build dependency graph and detect circular references
         logger.info("Building dependency graph...")
         for cell_data in workbook_data['cells']:
-            cell_ref = f"{cell_data['sheet_name']}!{cell_data['cell']}"
-            self.circular_detector.add_dependency(cell_ref, cell_data['depends_on'])
+            self.circular_detector.add_dependency(cell_data['cell_ref'], cell_data['depends_on'])
         
         circular_groups = self.circular_detector.detect_cycles()
         self.stats['circular_references'] = sum(len(group) for group in circular_groups)
         
         # Mark circular cells
         for cell_data in workbook_data['cells']:
-            cell_ref = f"{cell_data['sheet_name']}!{cell_data['cell']}"
-            cell_data['is_circular'] = self.circular_detector.is_circular(cell_ref)
+            cell_data['is_circular'] = self.circular_detector.is_circular(cell_data['cell_ref'])
         
         # Create model record
         workbook_meta = {
@@ -678,12 +1170,6 @@ class ExcelImporter:
         """
         logger.info(f"Evaluating {self.stats['formula_cells']} formula cells...")
         
-        # Build lookup for quick access
-        cell_lookup = {}
-        for cell in cells_data:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
-            cell_lookup[cell_ref] = cell
-        
         # Separate circular from non-circular
         circular_cells = []
         non_circular_cells = []
@@ -695,12 +1181,16 @@ class ExcelImporter:
                 else:
                     non_circular_cells.append(cell)
         
+        # Only the iterative solver looks cells up by reference, and only
+        # circular ones, so the lookup is limited to those
+        cell_lookup = {cell['cell_ref']: cell for cell in circular_cells}
+        
         logger.info(f"Non-circular formulas: {len(non_circular_cells)}, "
                    f"Circular formulas: {len(circular_cells)}")
         
         # Evaluate non-circular formulas
         for cell in non_circular_cells:
-            self._evaluate_single_cell(cell, cell_lookup)
+            self._evaluate_single_cell(cell)
         
         # Evaluate circular formulas with iterative solver
         if circular_cells:
@@ -708,22 +1198,17 @@ class ExcelImporter:
         
         logger.info("Formula evaluation complete")
     
-    def _evaluate_single_cell(self, cell: Dict, cell_lookup: Dict):
+    def _evaluate_single_cell(self, cell: Dict):
         """Evaluate a single non-circular formula cell."""
         formula = cell.get('formula', '')
         
         if not formula:
             return
         
-        # Classify engine type
-        if self._is_hyperformula_compatible(formula):
-            cell['calculation_engine'] = 'hyperformula'
-            cell['converted_formula'] = formula
-        elif self._is_custom_function(formula):
-            cell['calculation_engine'] = 'custom'
+        # The engine was picked when the cell was parsed
+        if cell['calculation_engine'] == 'custom':
             cell['converted_formula'] = self._convert_for_custom(formula)
         else:
-            cell['calculation_engine'] = 'hyperformula'
             cell['converted_formula'] = formula
         
         # Attempt to evaluate
@@ -745,21 +1230,18 @@ class ExcelImporter:
                         self.stats['mismatches'] += 1
             else:
                 # Try to evaluate numeric formula
-                result_value = self._evaluate_numeric_formula(cell, cell_lookup)
+                result_value = self._evaluate_numeric_formula(cell)
                 cell['calculated_value'] = result_value
                 cell['calculated_text'] = None
                 
                 # Compare with raw_value if available
                 if result_value is not None and cell.get('raw_value') is not None:
-                    diff = abs(float(result_value) - float(cell['raw_value']))
-                    if diff > TOLERANCE:
+                    diff = abs(result_value - cell['raw_value'])
+                    bucket = comparison_bucket(diff)
+                    self.stats[COMPARISON_STATS[bucket]] += 1
+                    if bucket == MISMATCH:
                         cell['has_mismatch'] = True
-                        cell['mismatch_diff'] = float(diff)
-                        self.stats['mismatches'] += 1
-                    elif diff < 1e-10:
-                        self.stats['exact_matches'] += 1
-                    else:
-                        self.stats['within_tolerance'] += 1
+                        cell['mismatch_diff'] = diff
         except Exception as e:
             logger.error(f"Evaluation failed for {cell['sheet_name']}!{cell['cell']}: {e}")
             cell['calculated_value'] = None
@@ -779,7 +1261,7 @@ class ExcelImporter:
             return ''
         
         # Extract string literal
-        match = re.match(r'^="([^"]*)"$', formula.strip())
+        match = STRING_LITERAL_FORMULA_PATTERN.match(formula.strip())
         if match:
             return match.group(1)
         
@@ -787,7 +1269,7 @@ class ExcelImporter:
         logger.warning(f"Complex text formula not evaluated: {formula}")
         return None
     
-    def _evaluate_numeric_formula(self, cell: Dict, cell_lookup: Dict) -> Optional[float]:
+    def _evaluate_numeric_formula(self, cell: Dict) -> Optional[float]:
         """
         Evaluate numeric formula.
         
@@ -796,18 +1278,21 @@ class ExcelImporter:
         """
         formula = cell.get('formula', '')
         
-        # Simple constant formulas
-        if re.match(r'^=\d+(\.\d+)?$', formula):
-            return float(formula[1:])
+        # Simple constant formulas (=123 or =1.5), checked with str methods
+        # rather than a regex
+        if formula[:1] == '=':
+            whole, point, fraction = formula[1:].partition('.')
+            if whole.isdecimal() and (not point or fraction.isdecimal()):
+                return float(formula[1:])
         
         # For complex formulas, use raw_value as fallback ONLY for verification
         # This is NOT copying - it's using Excel's computed value as reference
         # The actual evaluation would come from HyperFormula in production
         if cell.get('raw_value') is not None:
             # Log that we're using raw_value as placeholder
-            logger.debug(f"Using raw_value as placeholder for {cell['sheet_name']}!{cell['cell']} "
-                        f"(formula: {formula[:50]}...)")
-            return float(cell['raw_value'])
+            logger.debug("Using raw_value as placeholder for %s (formula: %s...)",
+                         cell['cell_ref'], formula[:50])
+            return cell['raw_value']
         
         # If no raw_value, set NULL
         return None
@@ -817,7 +1302,24 @@ class ExcelImporter:
         logger.info(f"Evaluating {len(circular_cells)} circular formulas...")
         
         # Build list of cell references
-        circular_refs = [f"{c['sheet_name']}!{c['cell']}" for c in circular_cells]
+        circular_refs = [c['cell_ref'] for c in circular_cells]
+        
+        # The solver calls evaluate_func once per cell per iteration, and the
+        # answer doesn't depend on the iteration, so resolve it up front.
+        # The cells are at hand already, so no lookup by reference is needed.
+        reference_values = {}
+        for cell in circular_cells:
+            cell_ref = cell['cell_ref']
+            
+            # Use raw_value from Excel as the calculated result
+            # This is acceptable because Excel already computed the circular value
+            # In production, would re-evaluate with HyperFormula/custom engine
+            raw_value = cell.get('raw_value')
+            if raw_value is not None:
+                reference_values[cell_ref] = raw_value
+            else:
+                # If no raw_value, try to return 0 for convergence
+                reference_values[cell_ref] = 0.0
         
         # Evaluation function that uses raw_value as reference
         def evaluate_func(cell_ref: str, values: Dict) -> Optional[float]:
@@ -826,18 +1328,7 @@ class ExcelImporter:
             Uses raw_value as reference since actual formula evaluation
             requires full HyperFormula/custom implementation.
             """
-            cell = cell_lookup.get(cell_ref)
-            if not cell:
-                return None
-            
-            # Use raw_value from Excel as the calculated result
-            # This is acceptable because Excel already computed the circular value
-            # In production, would re-evaluate with HyperFormula/custom engine
-            if cell.get('raw_value') is not None:
-                return float(cell['raw_value'])
-            
-            # If no raw_value, try to return 0 for convergence
-            return 0.0
+            return reference_values.get(cell_ref)
         
         # Run solver
         results, status, iterations = self.circular_solver.solve(
@@ -846,9 +1337,12 @@ class ExcelImporter:
             evaluate_func
         )
         
-        # Apply results to cells
+        # Apply results to cells. Comparison outcomes are tallied in locals
+        # and added to the stats once, rather than a dict update per cell.
+        bucket_counts = [0, 0, 0]
+        converged = 0
         for cell in circular_cells:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+            cell_ref = cell['cell_ref']
             result = results.get(cell_ref)
             
             cell['calculation_engine'] = 'custom'  # Iterative solver is custom
@@ -856,48 +1350,28 @@ class ExcelImporter:
             cell['calculated_value'] = result
             cell['calculated_text'] = None
             
-            # Compare with raw_value to detect mismatches
-            if result is not None and cell.get('raw_value') is not None:
-                diff = abs(float(result) - float(cell['raw_value']))
-                if diff > TOLERANCE:
-                    cell['has_mismatch'] = True
-                    cell['mismatch_diff'] = float(diff)
-                    self.stats['mismatches'] += 1
-                elif diff < 1e-10:
-                    self.stats['exact_matches'] += 1
-                else:
-                    self.stats['within_tolerance'] += 1
-            
-            if result is not None:
-                self.stats['circular_converged'] += 1
-            else:
+            if result is None:
                 self.stats['circular_failed'] += 1
                 logger.error(f"Failed to converge: {cell_ref}")
+                continue
+            
+            converged += 1
+            
+            # Compare with raw_value to detect mismatches
+            raw_value = cell.get('raw_value')
+            if raw_value is not None:
+                diff = abs(float(result) - raw_value)
+                bucket = comparison_bucket(diff)
+                bucket_counts[bucket] += 1
+                if bucket == MISMATCH:
+                    cell['has_mismatch'] = True
+                    cell['mismatch_diff'] = diff
         
-        logger.info(f"Circular solver: {status}, iterations: {iterations}")
-    
-    def _is_hyperformula_compatible(self, formula: str) -> bool:
-        """Check if formula is compatible with HyperFormula."""
-        # List of known incompatible functions
-        incompatible = ['IRR', 'XIRR', 'XNPV', 'MIRR']
-        formula_upper = formula.upper()
-        
-        for func in incompatible:
-            if func + '(' in formula_upper:
-                return False
-        
-        return True
-    
-    def _is_custom_function(self, formula: str) -> bool:
-        """Check if formula requires custom implementation."""
-        custom_funcs = ['IRR', 'XIRR', 'XNPV', 'MIRR']
-        formula_upper = formula.upper()
-        
-        for func in custom_funcs:
-            if func + '(' in formula_upper:
-                return True
+        for stat, count in zip(COMPARISON_STATS, bucket_counts):
+            self.stats[stat] += count
+        self.stats['circular_converged'] += converged
         
-        return False
+        logger.info(f"Circular solver: {status}, iterations: {iterations}")
     
     def _convert_for_custom(self, formula: str) -> str:
         """Convert formula for custom evaluation."""
@@ -905,33 +1379,53 @@ class ExcelImporter:
         # e.g., =IRR(B65:V65) → =IRR_CUSTOM(B65:V65)
         return formula
     
-    def bulk_insert_cells(self, model_id: int, cells_data: List[Dict]):
-        """Bulk insert cells in batches."""
-        BATCH_SIZE = 1000
+    def bulk_insert_cells(self, model_id: int, cells_data: Iterable[Dict]):
+        """
+        Bulk insert cells with PostgreSQL COPY, in batches.
         
-        for i in range(0, len(cells_data), BATCH_SIZE):
-            batch = cells_data[i:i + BATCH_SIZE]
-            cell_objects = []
-            
-            for cell_data in batch:
-                cell_obj = Cell(
-                    model_id=model_id,
-                    **{k: v for k, v in cell_data.items() if k in [
-                        'sheet_name', 'cell', 'row_num', 'col_letter', 'cell_type',
-                        'raw_value', 'raw_text', 'formula', 'data_type', 'depends_on', 'is_circular',
-                        'has_validation', 'validation_type', 'validation_options',
-                        'style', 'calculation_engine', 'converted_formula',
-                        'calculated_value', 'calculated_text', 'has_mismatch', 'mismatch_diff'
-                    ]}
-                )
-                cell_objects.append(cell_obj)
-            
-            self.session.bulk_save_objects(cell_objects)
-            self.session.flush()
+        Each batch is written to an in-memory buffer in COPY text format and
+        streamed through the session's own connection, so it shares the
+        transaction that created the model row. Only one batch's buffer is
+        held at a time.
+        
+        cells_data may be any iterable, including a generator; batches are
+        taken from it as they are needed and it is never materialised.
+        """
+        BATCH_SIZE = 10000
+        
+        # model_id leads every row; the remaining columns come from the cell
+        # dict, falling back to the NOT NULL defaults
+        row_prefix = format_copy_field(model_id) + '\t'
+        cursor = self.session.connection().connection.cursor()
+        
+        try:
+            cells_iter = iter(cells_data)
+            total_cells = 0
+            batch_num = 0
             
-            logger.debug(f"Inserted batch {i//BATCH_SIZE + 1} ({len(batch)} cells)")
+            while True:
+                batch = list(islice(cells_iter, BATCH_SIZE))
+                if not batch:
+                    break
+                batch_num += 1
+                total_cells += len(batch)
+                buffer = io.StringIO()
+                
+                for cell_data in batch:
+                    buffer.write(row_prefix)
+                    buffer.write('\t'.join(
+                        format_copy_field(cell_data.get(col, default)) for col, default in CELL_COPY_FIELDS
+                    ))
+                    buffer.write('\n')
+                
+                buffer.seek(0)
+                cursor.copy_expert(CELL_COPY_SQL, buffer)
+                
+                logger.debug("Inserted batch %d (%d cells)", batch_num, len(batch))
+        finally:
+            cursor.close()
         
-        logger.info(f"Inserted {len(cells_data)} cells")
+        logger.info(f"Inserted {total_cells} cells")
 
 
 class ImportValidator:
@@ -951,14 +1445,19 @@ class ImportValidator:
         # Placeholder implementation
         logger.info(f"Validating model {self.model_id}")
         
-        formula_cells = self.session.query(Cell).filter(
+        # Only the number of formula cells is needed until re-evaluation is
+        # implemented, so count them in the database rather than loading
+        # every Cell. Re-evaluation should stream just the columns it needs,
+        # e.g. query(Cell.cell, Cell.formula, Cell.raw_value)
+        # .execution_options(stream_results=True).yield_per(1000).
+        total_formula_cells = self.session.query(func.count()).select_from(Cell).filter(
             Cell.model_id == self.model_id,
             Cell.cell_type.in_(['formula', 'formula_text'])
-        ).all()
+        ).scalar()
         
         stats = {
             'status': 'passed',
-            'total': len(formula_cells),
+            'total': total_formula_cells,
             'matches': 0,
             'mismatches': 0,
             'errors': 0,
@@ -973,6 +1472,23 @@ class ImportValidator:
         return stats
 
 
+# Per-process state for parse_workbook's sheet workers
+_sheet_worker: Optional[Tuple[ExcelImporter, Any]] = None
+
+
+def init_sheet_worker(file_path: str):
+    """Process pool initializer: load the workbook once per worker."""
+    global _sheet_worker
+    wb = openpyxl.load_workbook(file_path, data_only=False, read_only=True, keep_links=False)
+    _sheet_worker = (ExcelImporter(session=None), wb)
+
+
+def parse_sheet_in_worker(sheet_name: str) -> Tuple[Dict, List[Dict], List[str]]:
+    """Parse one sheet in a pool worker; see ExcelImporter._parse_sheet."""
+    importer, wb = _sheet_worker
+    return importer._parse_sheet(wb, sheet_name)
+
+
 # CLI Commands
 
 @click.group()
@@ -989,15 +1505,28 @@ def cli():
 def import_cmd(file: str, name: str, validate: bool):
     """Import an Excel workbook into PostgreSQL."""
     try:
-        # Create database engine and session
-        engine = create_engine(DATABASE_URL)
+        # Create database engine and session. Cells are loaded with COPY;
+        # any other executemany (e.g. bulk UPDATEs) is sent as multi-row
+        # VALUES / execute_batch pages rather than one statement per row.
+        engine = create_engine(
+            DATABASE_URL,
+            executemany_mode='values_plus_batch',
+            insertmanyvalues_page_size=1000
+        )
+        logger.info(f"Database driver: {engine.dialect.driver}")
         Base.metadata.create_all(engine)
-        Session = sessionmaker(bind=engine)
+        # Cells are loaded with COPY, so the session only tracks the Model
+        # row; don't autoflush it or reload it (with its import summary)
+        # after every commit
+        Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
         session = Session()
         
         # Import file
         importer = ExcelImporter(session)
-        model_id = importer.import_file(file, name, validate=validate)
+        try:
+            model_id = importer.import_file(file, name, validate=validate)
+        finally:
+            importer.close()
         
         click.echo(f"\n✓ Import successful!")
         click.echo(f"Model ID: {model_id}")
@@ -8,6 +8,12 @@
  * 
  * Usage:
  *   echo '{"sheets": [...], "queries": [...]}' | node hyperformula_wrapper.js
+ *
+ *   node hyperformula_wrapper.js --worker
+ *     Long-lived mode: requests and responses are JSON documents framed by
+ *     a 4-byte little-endian length prefix. Send {"cmd": "exit"} (or close
+ *     stdin) to stop. {"cmd": "load", "sheets": [...]} loads sheets on
+ *     their own; later requests may then send only "queries".
  * 
  * Input format:
  * {
@@ -36,179 +42,349 @@
 
 const { HyperFormula } = require('hyperformula');
 
-// Configure stdin to read UTF-8
-process.stdin.setEncoding('utf8');
+const crypto = require('crypto');
 
-let inputData = '';
+// Size of the length prefix on each worker-mode frame
+const FRAME_HEADER_BYTES = 4;
 
-// Read all input from stdin
-process.stdin.on('data', (chunk) => {
-    inputData += chunk;
-});
+// Initialize HyperFormula with GPL v3 license
+const hfOptions = {
+    licenseKey: 'gpl-v3',
+    // Enable more Excel-compatible functions
+    useArrayArithmetic: true,
+    useColumnIndex: false,
+    // Precision settings
+    precisionRounding: 10,
+    precisionEpsilon: 1e-10,
+    // Date settings for proper date handling
+    nullDate: { year: 1899, month: 12, day: 30 },
+    // Error handling
+    smartRounding: true,
+    // Enable iterative calculation for circular references
+    useStats: true,
+    evaluateNullToZero: true
+};
+
+/**
+ * Validate the "sheets" array of a request.
+ */
+function validateSheets(request) {
+    if (!request.sheets || !Array.isArray(request.sheets)) {
+        throw new Error('Invalid request: missing or invalid "sheets" array');
+    }
+}
+
+/**
+ * Validate the "queries" array of a request.
+ */
+function validateQueries(request) {
+    if (!request.queries || !Array.isArray(request.queries)) {
+        throw new Error('Invalid request: missing or invalid "queries" array');
+    }
+}
+
+/**
+ * Validate the structure of an evaluation request.
+ */
+function validateRequest(request) {
+    validateSheets(request);
+    validateQueries(request);
+}
 
-// Process when all input is received
-process.stdin.on('end', () => {
-    try {
-        // Parse input JSON
-        const request = JSON.parse(inputData);
+/**
+ * Build a HyperFormula instance populated with the given sheets.
+ */
+function buildEngine(sheets) {
+    const hf = HyperFormula.buildEmpty(hfOptions);
+    
+    // Add sheets and populate cells
+    sheets.forEach(sheet => {
+        if (!sheet.name) {
+            throw new Error('Sheet missing "name" property');
+        }
+        
+        // Add sheet to HyperFormula
+        hf.addSheet(sheet.name);
+        const sheetId = hf.getSheetId(sheet.name);
         
-        // Validate request structure
-        if (!request.sheets || !Array.isArray(request.sheets)) {
-            throw new Error('Invalid request: missing or invalid "sheets" array');
+        if (sheetId === undefined) {
+            throw new Error(`Failed to create sheet: ${sheet.name}`);
         }
-        if (!request.queries || !Array.isArray(request.queries)) {
-            throw new Error('Invalid request: missing or invalid "queries" array');
+        
+        // Populate cells
+        if (sheet.cells && Array.isArray(sheet.cells)) {
+            sheet.cells.forEach(cell => {
+                const address = { sheet: sheetId, col: cell.col, row: cell.row };
+                
+                // Set cell content (formula or value)
+                if (cell.formula !== undefined) {
+                    hf.setCellContents(address, [[cell.formula]]);
+                } else if (cell.value !== undefined) {
+                    hf.setCellContents(address, [[cell.value]]);
+                }
+            });
         }
+    });
+    
+    return hf;
+}
+
+/**
+ * Execute queries against a populated engine and build the response.
+ */
+function evaluateQueries(hf, request) {
+    const results = request.queries.map(query => {
+        const sheetId = hf.getSheetId(query.sheet);
         
-        // Initialize HyperFormula with GPL v3 license
-        const hfOptions = {
-            licenseKey: 'gpl-v3',
-            // Enable more Excel-compatible functions
-            useArrayArithmetic: true,
-            useColumnIndex: false,
-            // Precision settings
-            precisionRounding: 10,
-            precisionEpsilon: 1e-10,
-            // Date settings for proper date handling
-            nullDate: { year: 1899, month: 12, day: 30 },
-            // Error handling
-            smartRounding: true,
-            // Enable iterative calculation for circular references
-            useStats: true,
-            evaluateNullToZero: true
-        };
+        if (sheetId === undefined) {
+            return {
+                cell: query.cell,
+                value: null,
+                type: 'error',
+                error: `Sheet not found: ${query.sheet}`
+            };
+        }
         
-        const hf = HyperFormula.buildEmpty(hfOptions);
+        const address = { sheet: sheetId, col: query.col, row: query.row };
         
-        // Add sheets and populate cells
-        request.sheets.forEach(sheet => {
-            if (!sheet.name) {
-                throw new Error('Sheet missing "name" property');
-            }
+        try {
+            const cellValue = hf.getCellValue(address);
+            const cellType = hf.getCellType(address);
             
-            // Add sheet to HyperFormula
-            hf.addSheet(sheet.name);
-            const sheetId = hf.getSheetId(sheet.name);
+            // Handle different cell value types
+            let resultValue = cellValue;
+            let resultType = 'unknown';
             
-            if (sheetId === undefined) {
-                throw new Error(`Failed to create sheet: ${sheet.name}`);
+            if (cellValue === null || cellValue === undefined) {
+                resultType = 'empty';
+                resultValue = null;
+            } else if (typeof cellValue === 'number') {
+                resultType = 'number';
+                resultValue = cellValue;
+            } else if (typeof cellValue === 'string') {
+                resultType = 'text';
+                resultValue = cellValue;
+            } else if (typeof cellValue === 'boolean') {
+                resultType = 'boolean';
+                resultValue = cellValue;
+            } else if (cellValue && typeof cellValue === 'object') {
+                // Handle HyperFormula error objects (ERROR, CYCLE, etc.)
+                if (cellValue.type === 'ERROR' || cellValue.type === 'CYCLE') {
+                    resultType = 'error';
+                    resultValue = cellValue.value || cellValue.type || 'ERROR';
+                }
             }
             
-            // Populate cells
-            if (sheet.cells && Array.isArray(sheet.cells)) {
-                sheet.cells.forEach(cell => {
-                    const address = { sheet: sheetId, col: cell.col, row: cell.row };
-                    
-                    // Set cell content (formula or value)
-                    if (cell.formula !== undefined) {
-                        hf.setCellContents(address, [[cell.formula]]);
-                    } else if (cell.value !== undefined) {
-                        hf.setCellContents(address, [[cell.value]]);
-                    }
-                });
+            return {
+                cell: query.cell,
+                value: resultValue,
+                type: resultType,
+                cellType: cellType
+            };
+        } catch (error) {
+            return {
+                cell: query.cell,
+                value: null,
+                type: 'error',
+                error: error.message
+            };
+        }
+    });
+    
+    return {
+        success: true,
+        results: results,
+        stats: {
+            sheets: hf.getSheetNames().length,
+            queries: request.queries.length
+        }
+    };
+}
+
+function errorResponse(error) {
+    return {
+        success: false,
+        error: error.message,
+        stack: process.env.NODE_ENV === 'development' ? error.stack : undefined
+    };
+}
+
+/**
+ * Write one length-prefixed JSON frame to stdout.
+ */
+function writeFrame(message) {
+    const body = Buffer.from(JSON.stringify(message), 'utf8');
+    const header = Buffer.alloc(FRAME_HEADER_BYTES);
+    header.writeUInt32LE(body.length, 0);
+    process.stdout.write(Buffer.concat([header, body]));
+}
+
+/**
+ * Worker mode: one length-prefixed JSON request per frame on stdin, one
+ * response frame on stdout, until {"cmd": "exit"} or EOF. The engine is
+ * kept between requests and only rebuilt when the sheets payload changes.
+ * A request without "sheets" is answered from the engine already loaded.
+ */
+function runWorker() {
+    let hf = null;
+    let sheetsHash = null;
+    
+    const loadSheets = (sheets) => {
+        const hash = crypto.createHash('sha1').update(JSON.stringify(sheets)).digest('hex');
+        if (hf === null || hash !== sheetsHash) {
+            if (hf !== null) {
+                hf.destroy();
             }
-        });
-        
-        // Execute queries and collect results
-        const results = request.queries.map(query => {
-            const sheetId = hf.getSheetId(query.sheet);
+            // Drop the old engine before building, so sheets that fail to
+            // build can't leave it answering the next request
+            hf = null;
+            sheetsHash = null;
+            hf = buildEngine(sheets);
+            sheetsHash = hash;
+        }
+    };
+    
+    // Incoming bytes are collected as chunks and only joined once a whole
+    // frame has arrived, so large requests aren't copied on every read
+    let chunks = [];
+    let buffered = 0;
+    let frameLength = null;
+    
+    const joined = () => {
+        if (chunks.length > 1) {
+            chunks = [Buffer.concat(chunks, buffered)];
+        }
+        return chunks[0];
+    };
+    
+    const handleRequest = (payload) => {
+        let response;
+        try {
+            const request = JSON.parse(payload);
             
-            if (sheetId === undefined) {
-                return {
-                    cell: query.cell,
-                    value: null,
-                    type: 'error',
-                    error: `Sheet not found: ${query.sheet}`
-                };
+            if (request.cmd === 'exit') {
+                process.exit(0);
             }
             
-            const address = { sheet: sheetId, col: query.col, row: query.row };
-            
-            try {
-                const cellValue = hf.getCellValue(address);
-                const cellType = hf.getCellType(address);
-                
-                // Handle different cell value types
-                let resultValue = cellValue;
-                let resultType = 'unknown';
-                
-                if (cellValue === null || cellValue === undefined) {
-                    resultType = 'empty';
-                    resultValue = null;
-                } else if (typeof cellValue === 'number') {
-                    resultType = 'number';
-                    resultValue = cellValue;
-                } else if (typeof cellValue === 'string') {
-                    resultType = 'text';
-                    resultValue = cellValue;
-                } else if (typeof cellValue === 'boolean') {
-                    resultType = 'boolean';
-                    resultValue = cellValue;
-                } else if (cellValue && typeof cellValue === 'object') {
-                    // Handle HyperFormula error objects (ERROR, CYCLE, etc.)
-                    if (cellValue.type === 'ERROR' || cellValue.type === 'CYCLE') {
-                        resultType = 'error';
-                        resultValue = cellValue.value || cellValue.type || 'ERROR';
-                    }
-                }
-                
-                return {
-                    cell: query.cell,
-                    value: resultValue,
-                    type: resultType,
-                    cellType: cellType
-                };
-            } catch (error) {
-                return {
-                    cell: query.cell,
-                    value: null,
-                    type: 'error',
-                    error: error.message
+            if (request.cmd === 'load') {
+                validateSheets(request);
+                loadSheets(request.sheets);
+                response = {
+                    success: true,
+                    stats: { sheets: request.sheets.length }
                 };
+            } else {
+                validateQueries(request);
+                if (request.sheets !== undefined) {
+                    validateSheets(request);
+                    loadSheets(request.sheets);
+                } else if (hf === null) {
+                    throw new Error('Invalid request: no sheets loaded');
+                }
+                response = evaluateQueries(hf, request);
             }
-        });
+        } catch (error) {
+            // A request that only fails validation keeps the loaded engine
+            response = errorResponse(error);
+        }
         
-        // Output success response
-        const response = {
-            success: true,
-            results: results,
-            stats: {
-                sheets: request.sheets.length,
-                queries: request.queries.length
-            }
-        };
+        writeFrame(response);
+    };
+    
+    process.stdin.on('data', (chunk) => {
+        chunks.push(chunk);
+        buffered += chunk.length;
         
-        console.log(JSON.stringify(response));
+        while (true) {
+            if (frameLength === null) {
+                if (buffered < FRAME_HEADER_BYTES) {
+                    return;
+                }
+                frameLength = joined().readUInt32LE(0);
+            }
+            
+            const frameEnd = FRAME_HEADER_BYTES + frameLength;
+            if (buffered < frameEnd) {
+                return;
+            }
+            
+            const data = joined();
+            const payload = data.toString('utf8', FRAME_HEADER_BYTES, frameEnd);
+            const rest = data.subarray(frameEnd);
+            chunks = rest.length ? [rest] : [];
+            buffered = rest.length;
+            frameLength = null;
+            
+            handleRequest(payload);
+        }
+    });
+    
+    process.stdin.on('end', () => {
         process.exit(0);
-        
-    } catch (error) {
-        // Output error response
-        const errorResponse = {
-            success: false,
-            error: error.message,
-            stack: process.env.NODE_ENV === 'development' ? error.stack : undefined
-        };
-        
-        console.log(JSON.stringify(errorResponse));
-        process.exit(1);
-    }
-});
+    });
+}
 
-// Handle process errors
-process.on('uncaughtException', (error) => {
+/**
+ * One-shot mode: read a single request until EOF, respond, and exit.
+ */
+function runOnce() {
+    // Configure stdin to read UTF-8
+    process.stdin.setEncoding('utf8');
+    
+    let inputData = '';
+    
+    // Read all input from stdin
+    process.stdin.on('data', (chunk) => {
+        inputData += chunk;
+    });
+    
+    // Process when all input is received
+    process.stdin.on('end', () => {
+        try {
+            const request = JSON.parse(inputData);
+            validateRequest(request);
+            
+            const hf = buildEngine(request.sheets);
+            console.log(JSON.stringify(evaluateQueries(hf, request)));
+            process.exit(0);
+            
+        } catch (error) {
+            console.log(JSON.stringify(errorResponse(error)));
+            process.exit(1);
+        }
+    });
+}
+
+const workerMode = process.argv.includes('--worker');
+
+if (workerMode) {
+    runWorker();
+} else {
+    runOnce();
+}
+
+/**
+ * Report a fatal error and exit. In worker mode the caller reads
+ * length-prefixed frames, so the error must be framed as well.
+ */
+function exitWithError(message) {
     const errorResponse = {
         success: false,
-        error: `Uncaught exception: ${error.message}`
+        error: message
     };
-    console.log(JSON.stringify(errorResponse));
+    if (workerMode) {
+        writeFrame(errorResponse);
+    } else {
+        console.log(JSON.stringify(errorResponse));
+    }
     process.exit(1);
+}
+
+// Handle process errors
+process.on('uncaughtException', (error) => {
+    exitWithError(`Uncaught exception: ${error.message}`);
 });
 
 process.on('unhandledRejection', (reason, promise) => {
-    const errorResponse = {
-        success: false,
-        error: `Unhandled rejection: ${reason}`
-    };
-    console.log(JSON.stringify(errorResponse));
-    process.exit(1);
+    exitWithError(`Unhandled rejection: ${reason}`);
 });
\ No newline at end of file
@@ -8,21 +8,28 @@ the CLI tool, with progress callback support for API integration.
 import os
 import hashlib
 import logging
+import math
 import json
+import io
 import subprocess
+import select
+import struct
+import time
 import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any, Set, Callable
 from decimal import Decimal
 import re
+from itertools import chain, repeat
 
+import orjson
 from sqlalchemy.orm import Session
 import openpyxl
+from openpyxl.cell.read_only import EMPTY_CELL
 from openpyxl.utils import get_column_letter, column_index_from_string
-import networkx as nx
 
-from backend.models.schema import Model, Cell
+from backend.models.schema import Model
 from services.formula_service import FormulaParser
 
 logger = logging.getLogger(__name__)
@@ -31,22 +38,159 @@ logger = logging.getLogger(__name__)
 DEFAULT_TOLERANCE = 1e-6
 DEFAULT_MAX_CIRCULAR_ITERATIONS = 100
 DEFAULT_CONVERGENCE_THRESHOLD = 1e-6
+
+# Largest move an Aitken extrapolation may make, as a multiple of the
+# cell's last change
+AITKEN_MAX_STEP_RATIO = 100
 DEFAULT_MODELS_DIR = 'models/'
 DEFAULT_HYPERFORMULA_WRAPPER = 'scripts/hyperformula_wrapper.js'
 
+# Read size (bytes) when hashing without hashlib.file_digest
+HASH_BLOCK_SIZE = 1 << 20
+
+# Length prefix on each HyperFormula worker message
+FRAME_HEADER = struct.Struct('<I')
+
+# data_type stored for each exact Python type of a cached cell value. bool
+# is an int subclass and has always been stored as a number.
+VALUE_DATA_TYPES = {
+    int: 'number',
+    float: 'number',
+    bool: 'number',
+    str: 'text',
+    datetime: 'date',
+}
+
+# Columns written by the cell COPY, in order
+CELL_COPY_COLUMNS = [
+    'model_id', 'sheet_name', 'cell', 'row_num', 'col_letter', 'cell_type',
+    'raw_value', 'raw_text', 'formula', 'data_type', 'depends_on', 'is_circular',
+    'has_validation', 'validation_type', 'validation_options',
+    'style', 'calculation_engine', 'converted_formula',
+    'calculated_value', 'calculated_text', 'has_mismatch', 'mismatch_diff'
+]
+
+# COPY writes every column, so NOT NULL columns that cell dicts may omit
+# get their server defaults here
+CELL_COPY_DEFAULTS = {
+    'data_type': 'text',
+    'depends_on': [],
+    'is_circular': False,
+    'has_validation': False,
+    'validation_options': [],
+    'style': {},
+    'calculation_engine': 'none',
+    'has_mismatch': False
+}
+
+# (column, default) pairs for the cell dict fields, i.e. every COPY column
+# after model_id, and the COPY statement itself; both are fixed, so they
+# are built once here rather than per batch
+CELL_COPY_FIELDS = tuple((col, CELL_COPY_DEFAULTS.get(col)) for col in CELL_COPY_COLUMNS[1:])
+CELL_COPY_SQL = f"COPY cell ({', '.join(CELL_COPY_COLUMNS)}) FROM STDIN"
+
+
+def format_copy_field(value: Any) -> str:
+    """Format a value as a field in PostgreSQL's COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
 
 class CircularReferenceDetector:
     """Detect and analyze circular references in formulas."""
     
     def __init__(self):
-        self.graph = nx.DiGraph()
+        # Cells are interned to integer ids; adjacency[i] lists the ids
+        # cell i depends on
+        self._cell_ids: Dict[str, int] = {}
+        self._cells: List[str] = []
+        self._adjacency: List[List[int]] = []
         self.circular_groups: List[List[str]] = []
+        self.circular_set: Set[str] = set()
+    
+    def _cell_id(self, cell: str) -> int:
+        """Return the integer id for a cell, assigning one if new."""
+        cell_id = self._cell_ids.get(cell)
+        if cell_id is None:
+            cell_id = self._cell_ids[cell] = len(self._cells)
+            self._cells.append(cell)
+            self._adjacency.append([])
+        return cell_id
     
     def add_dependency(self, cell: str, depends_on: List[str]):
         """Add a cell and its dependencies to the graph."""
-        self.graph.add_node(cell)
+        edges = self._adjacency[self._cell_id(cell)]
         for dep in depends_on:
-            self.graph.add_edge(cell, dep)
+            edges.append(self._cell_id(dep))
+    
+    def _strongly_connected_components(self) -> List[List[int]]:
+        """
+        Iterative Tarjan over the integer adjacency lists.
+        
+        Avoids recursion limits on long dependency chains and the per-node
+        dict overhead of a general-purpose graph library.
+        """
+        adjacency = self._adjacency
+        n = len(adjacency)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+            
+            while work:
+                v, i = work[-1]
+                successors = adjacency[v]
+                if i < len(successors):
+                    work[-1] = (v, i + 1)
+                    w = successors[i]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+        
+        return components
     
     def detect_cycles(self) -> List[List[str]]:
         """
@@ -55,10 +199,16 @@ class CircularReferenceDetector:
         Returns list of circular reference groups (strongly connected components).
         """
         try:
-            # Find strongly connected components (cycles)
-            cycles = list(nx.strongly_connected_components(self.graph))
-            # Filter out single nodes (not cycles)
-            self.circular_groups = [list(cycle) for cycle in cycles if len(cycle) > 1]
+            # Find strongly connected components (cycles). Single nodes are
+            # only a cycle when the cell refers to itself.
+            cells = self._cells
+            adjacency = self._adjacency
+            self.circular_groups = [
+                [cells[i] for i in component]
+                for component in self._strongly_connected_components()
+                if len(component) > 1 or component[0] in adjacency[component[0]]
+            ]
+            self.circular_set = {cell for group in self.circular_groups for cell in group}
             
             logger.info(f"Detected {len(self.circular_groups)} circular reference groups")
             for i, group in enumerate(self.circular_groups):
@@ -71,19 +221,58 @@ class CircularReferenceDetector:
     
     def is_circular(self, cell: str) -> bool:
         """Check if a cell is part of a circular reference."""
-        for group in self.circular_groups:
-            if cell in group:
-                return True
-        return False
+        return cell in self.circular_set
 
 
 class CircularSolver:
-    """Iterative solver for circular references."""
+    """
+    Iterative solver for circular references.
+    
+    Plain fixed-point iteration converges linearly, so with accelerate set
+    every third sweep is followed by an Aitken delta-squared extrapolation
+    of each numeric cell from its last three iterates.
+    
+    relaxation is the factor w in x_new = x_old + w * (f(x_old) - x_old):
+    1.0 is plain iteration, above 1 over-relaxes (faster on monotone
+    loops), below 1 under-relaxes (damps oscillating ones).
+    """
     
     def __init__(self, max_iterations: int = DEFAULT_MAX_CIRCULAR_ITERATIONS, 
-                 threshold: float = DEFAULT_CONVERGENCE_THRESHOLD):
+                 threshold: float = DEFAULT_CONVERGENCE_THRESHOLD,
+                 accelerate: bool = True,
+                 relaxation: float = 1.0):
         self.max_iterations = max_iterations
         self.threshold = threshold
+        self.accelerate = accelerate
+        self.relaxation = relaxation
+    
+    @staticmethod
+    def _aitken_extrapolate(x0s: Dict[str, Any], x1s: Dict[str, Any],
+                            x2s: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extrapolate each cell's limit from three successive iterates.
+        
+        A cell keeps its latest value unless all three iterates are finite
+        numbers, its changes are shrinking, and the extrapolated move is at
+        most AITKEN_MAX_STEP_RATIO times its last change.
+        """
+        accelerated = dict(x2s)
+        for cell_ref, x2 in x2s.items():
+            x0 = x0s.get(cell_ref)
+            x1 = x1s.get(cell_ref)
+            if not all(isinstance(x, (int, float)) and math.isfinite(x) for x in (x0, x1, x2)):
+                continue
+            
+            step = x2 - x1
+            previous_step = x1 - x0
+            if abs(step) >= abs(previous_step):
+                continue  # Not contracting; extrapolation would be a guess
+            
+            jump = -step * step / (step - previous_step)
+            if abs(jump) <= AITKEN_MAX_STEP_RATIO * abs(step):
+                accelerated[cell_ref] = x2 + jump
+        
+        return accelerated
     
     def solve(self, circular_cells: List[str], cell_data: Dict[str, Dict], 
               evaluate_func: Callable) -> Tuple[Dict[str, Any], str, int]:
@@ -97,22 +286,37 @@ class CircularSolver:
         """
         logger.info(f"Starting iterative solver for {len(circular_cells)} circular cells")
         
-        # Initialize with zeros for numeric, empty string for text
+        # Initialize with zeros for numeric, empty string for text. Each
+        # cell's data is looked up once here and carried through the sweeps
+        # in plan, so failures can report the formula without a lookup.
         values = {}
+        plan = []
         for cell_ref in circular_cells:
-            cell = cell_data.get(cell_ref)
-            if cell and FormulaParser.is_text_formula(cell.get('formula', '')):
+            cell = cell_data.get(cell_ref) or {}
+            if FormulaParser.is_text_formula(cell.get('formula', '')):
                 values[cell_ref] = ''
             else:
                 values[cell_ref] = 0.0
+            plan.append((cell_ref, cell))
         
         converged_cells = set()
         
+        # Loop invariants, read once rather than per cell
+        threshold = self.threshold
+        relaxation = self.relaxation
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # Plain iterates since the last extrapolation, and the change of the
+        # sweep it was made after (None once the next sweep has checked it)
+        accelerate = self.accelerate
+        history = []
+        extrapolated_after = None
+        
         for iteration in range(self.max_iterations):
             new_values = {}
             max_change = 0.0
             
-            for cell_ref in circular_cells:
+            for cell_ref, cell in plan:
                 # Note: Don't skip "converged" cells - in circular references,
                 # all cells must continue evaluating together even if individually stable
                 
@@ -123,22 +327,34 @@ class CircularSolver:
                     if result is None:
                         # Failed to evaluate - set NULL, DO NOT copy raw_value
                         logger.error(f"Failed to evaluate circular cell {cell_ref} "
-                                   f"(formula: {cell_data.get(cell_ref, {}).get('formula', 'N/A')})")
+                                   f"(formula: {cell.get('formula', 'N/A')})")
                         new_values[cell_ref] = None
                         continue
                     
                     new_values[cell_ref] = result
                     
                     # Calculate change
-                    if isinstance(result, (int, float)) and isinstance(values[cell_ref], (int, float)):
-                        change = abs(result - values[cell_ref])
-                        max_change = max(max_change, change)
+                    previous = values[cell_ref]
+                    if isinstance(result, (int, float)) and isinstance(previous, (int, float)):
+                        # Large values are judged relative to their size, so
+                        # they can converge at all; near zero, the absolute
+                        # change is the smaller of the two and is used
+                        change = abs(result - previous)
+                        scale = abs(result) + abs(previous)
+                        if scale > 0:
+                            change = min(change, 2 * change / scale)
+                        if change > max_change:
+                            max_change = change
+                        
+                        if relaxation != 1.0:
+                            new_values[cell_ref] = previous + relaxation * (result - previous)
                         
                         # Track converged cells for logging, but don't skip them
-                        if change < self.threshold:
+                        if change < threshold:
                             if cell_ref not in converged_cells:
                                 converged_cells.add(cell_ref)
-                                logger.debug(f"Cell {cell_ref} converged (change: {change:.2e})")
+                                if debug:
+                                    logger.debug(f"Cell {cell_ref} converged (change: {change:.2e})")
                         else:
                             # Cell started changing again, remove from converged set
                             converged_cells.discard(cell_ref)
@@ -149,69 +365,242 @@ class CircularSolver:
             
             values = new_values
             
-            logger.debug(f"Iteration {iteration + 1}: max_change={max_change:.2e}, "
-                        f"converged={len(converged_cells)}/{len(circular_cells)}")
+            if debug:
+                logger.debug(f"Iteration {iteration + 1}: max_change={max_change:.2e}, "
+                            f"converged={len(converged_cells)}/{len(circular_cells)}")
             
             # Check global convergence based on max change across all cells
-            if max_change < self.threshold:
+            if max_change < threshold:
                 logger.info(f"Converged after {iteration + 1} iterations")
                 return values, 'converged', iteration + 1
+            
+            # An extrapolation that made the next sweep change more than the
+            # one before it is not helping this loop, so stop extrapolating
+            if extrapolated_after is not None:
+                if max_change > extrapolated_after:
+                    logger.debug("Extrapolation increased the change; continuing without it")
+                    accelerate = False
+                extrapolated_after = None
+            
+            # Start the next sweep from the extrapolated values. The last
+            # iteration has no next sweep to evaluate them, so the values
+            # returned always come from an evaluated sweep.
+            if accelerate and iteration + 1 < self.max_iterations:
+                history.append(values)
+                if len(history) == 3:
+                    values = self._aitken_extrapolate(*history)
+                    history = []
+                    extrapolated_after = max_change
         
         logger.warning(f"Max iterations ({self.max_iterations}) reached without full convergence")
         return values, 'max_iterations', self.max_iterations
 
 
 class HyperFormulaEvaluator:
-    """Interface to HyperFormula via Node.js subprocess."""
+    """
+    Interface to HyperFormula via a persistent Node.js worker.
+    
+    The wrapper is started once in --worker mode and reused for every
+    batch, so Node start-up and the HyperFormula import are paid once per
+    import rather than per batch. Requests and responses are orjson
+    documents framed by a 4-byte little-endian length (FRAME_HEADER).
     
-    def __init__(self, wrapper_path: str = DEFAULT_HYPERFORMULA_WRAPPER):
+    Sheets are loaded into the worker once (load_sheets) and batches then
+    send only their queries (query), so the workbook isn't serialized and
+    piped again for every batch.
+    """
+    
+    def __init__(self, wrapper_path: str = DEFAULT_HYPERFORMULA_WRAPPER, timeout: float = 30):
         self.wrapper_path = wrapper_path
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        
+        # Sheets last passed to load_sheets, the digest of their load
+        # request, and whether the running worker holds them
+        self.sheets_data: Optional[List[Dict]] = None
+        self.sheets_digest: Optional[str] = None
+        self.sheets_loaded = False
         
         if not Path(wrapper_path).exists():
             logger.warning(f"HyperFormula wrapper not found at {wrapper_path}")
     
-    def evaluate_batch(self, sheets_data: List[Dict], queries: List[Dict]) -> Dict:
+    def _ensure_worker(self) -> subprocess.Popen:
+        """Start the Node.js worker on first use, or restart it if it died."""
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                ['node', self.wrapper_path, '--worker'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            self.sheets_loaded = False
+        return self.process
+    
+    def _kill_worker(self):
+        """Terminate a worker that timed out or broke the protocol."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+    
+    @staticmethod
+    def _write_frame(process: subprocess.Popen, payload: bytes):
+        """Send one length-prefixed JSON message to the worker."""
+        process.stdin.write(FRAME_HEADER.pack(len(payload)))
+        process.stdin.write(payload)
+        process.stdin.flush()
+    
+    @staticmethod
+    def _read_exact(fd: int, size: int, deadline: float) -> Optional[bytes]:
         """
-        Evaluate multiple formulas using HyperFormula.
+        Read exactly size bytes from fd before deadline.
         
-        Args:
-            sheets_data: List of sheet definitions with cells
-            queries: List of cells to evaluate
-        
-        Returns:
-            Result dictionary with success flag and results
+        Returns None if the worker closed its stdout first; raises
+        TimeoutError if the deadline passes.
         """
-        request = {
-            'sheets': sheets_data,
-            'queries': queries
-        }
+        data = bytearray()
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return bytes(data)
+    
+    def _read_frame(self, process: subprocess.Popen, deadline: float) -> Optional[bytes]:
+        """Read one length-prefixed response body from the worker."""
+        # Read straight from the pipe's fd; the buffered stdout object is
+        # never used, so select() always sees unread data
+        fd = process.stdout.fileno()
+        header = self._read_exact(fd, FRAME_HEADER.size, deadline)
+        if header is None:
+            return None
+        return self._read_exact(fd, FRAME_HEADER.unpack(header)[0], deadline)
+    
+    def _send(self, payload: bytes) -> Dict:
+        """
+        Send one encoded request to the worker and return its response.
         
+        Failures are returned as {'success': False, 'error': ...}; a worker
+        that times out or breaks the protocol is killed.
+        """
         try:
-            # Call Node.js wrapper
-            process = subprocess.Popen(
-                ['node', self.wrapper_path],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            process = self._ensure_worker()
+            self._write_frame(process, payload)
             
-            stdout, stderr = process.communicate(json.dumps(request), timeout=30)
+            response = self._read_frame(process, time.monotonic() + self.timeout)
+            if response is None:
+                returncode = process.wait()
+                self.process = None
+                logger.error(f"HyperFormula worker exited (exit {returncode})")
+                return {'success': False, 'error': f'Worker exited with code {returncode}'}
             
-            if process.returncode != 0:
-                logger.error(f"HyperFormula error (exit {process.returncode}): {stderr}")
-                return {'success': False, 'error': stderr}
-            
-            result = json.loads(stdout)
-            logger.debug(f"HyperFormula evaluated {len(queries)} queries")
-            return result
+            return orjson.loads(response)
             
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             logger.error("HyperFormula evaluation timed out")
+            self._kill_worker()
             return {'success': False, 'error': 'Timeout'}
         except Exception as e:
             logger.error(f"HyperFormula evaluation failed: {e}")
+            self._kill_worker()
             return {'success': False, 'error': str(e)}
+    
+    def load_sheets(self, sheets_data: List[Dict]) -> Dict:
+        """
+        Load sheets into the worker for later query() calls.
+        
+        Nothing is sent if the worker already holds these sheets: the same
+        list object is recognised without serializing it, and an equal one
+        by the digest of its load request. sheets_data must not be modified
+        after it is loaded.
+        
+        Returns:
+            Result dictionary with success flag
+        """
+        if sheets_data is self.sheets_data and self.sheets_loaded:
+            return {'success': True}
+        
+        payload = orjson.dumps({'cmd': 'load', 'sheets': sheets_data})
+        digest = hashlib.sha256(payload).hexdigest()
+        self.sheets_data = sheets_data
+        
+        if digest == self.sheets_digest and self.sheets_loaded:
+            return {'success': True}
+        
+        result = self._send(payload)
+        self.sheets_digest = digest
+        self.sheets_loaded = bool(result.get('success'))
+        return result
+    
+    def query(self, queries: List[Dict]) -> Dict:
+        """
+        Evaluate cells against the sheets loaded with load_sheets.
+        
+        The sheets are loaded again first if the worker was restarted or
+        the previous request failed.
+        
+        Args:
+            queries: List of cells to evaluate
+        
+        Returns:
+            Result dictionary with success flag and results
+        """
+        if self.sheets_data is None:
+            return {'success': False, 'error': 'No sheets loaded'}
+        
+        self._ensure_worker()
+        if not self.sheets_loaded:
+            result = self.load_sheets(self.sheets_data)
+            if not result.get('success'):
+                return result
+        
+        result = self._send(orjson.dumps({'queries': queries}))
+        if not result.get('success'):
+            # The worker may have dropped its engine; send the sheets again
+            # before the next query rather than trusting it still has them
+            self.sheets_loaded = False
+            return result
+        
+        logger.debug(f"HyperFormula evaluated {len(queries)} queries")
+        return result
+    
+    def evaluate_batch(self, sheets_data: List[Dict], queries: List[Dict]) -> Dict:
+        """
+        Evaluate multiple formulas using HyperFormula.
+        
+        Equivalent to load_sheets(sheets_data) followed by query(queries);
+        repeated calls with the same sheets only send the queries.
+        
+        Args:
+            sheets_data: List of sheet definitions with cells
+            queries: List of cells to evaluate
+        
+        Returns:
+            Result dictionary with success flag and results
+        """
+        result = self.load_sheets(sheets_data)
+        if not result.get('success'):
+            return result
+        return self.query(queries)
+    
+    def close(self):
+        """Ask the worker to exit and wait for it."""
+        if self.process is None:
+            return
+        
+        try:
+            if self.process.poll() is None:
+                self._write_frame(self.process, orjson.dumps({'cmd': 'exit'}))
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        finally:
+            self.process = None
 
 
 class ExcelImportService:
@@ -277,6 +666,10 @@ class ExcelImportService:
             'dropdown_cells': []
         }
     
+    def close(self):
+        """Release external resources (the HyperFormula worker)."""
+        self.hf_evaluator.close()
+    
     def _emit_progress(self, stage: str, percent: float, message: str):
         """Emit progress update via callback."""
         self.progress_callback(stage, percent, message)
@@ -307,51 +700,54 @@ class ExcelImportService:
         # Build cell reference lookup
         cell_lookup = {}
         for cell in cells_data:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
-            cell_lookup[cell_ref] = cell
+            cell_lookup[cell['ref']] = cell
         
-        # Build in-degree map (how many dependencies each cell has)
+        # Build in-degree map (how many dependencies each cell has) and the
+        # reverse map (which cells depend on each cell) in one pass over the
+        # edges, so the sort never has to rescan cells_data
         in_degree = {}
-        for cell in cells_data:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+        reverse_deps: Dict[str, List[Dict]] = {}
+        for cell_ref, cell in cell_lookup.items():
             in_degree[cell_ref] = 0
-        
-        # Count dependencies
-        for cell in cells_data:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
-            depends_on = cell.get('depends_on', [])
             
-            # Only count dependencies that are in our cell set (non-circular formulas)
-            for dep in depends_on:
+            # Only count dependencies that are in our cell set (non-circular
+            # formulas). A formula naming the same cell several times (e.g.
+            # =A1*A1) gets one edge; fromkeys keeps the order deterministic.
+            for dep in dict.fromkeys(cell.get('depends_on', ())):
                 if dep in cell_lookup:
                     in_degree[cell_ref] += 1
+                    reverse_deps.setdefault(dep, []).append(cell)
+        
+        # No formula depends on another one, so they all go in one batch
+        if not reverse_deps:
+            logger.info("Topological sort: 1 evaluation batch (no formula-to-formula dependencies)")
+            return [cells_data]
         
         # Initialize queue with cells that have no dependencies
-        queue = [cell for cell in cells_data if in_degree[f"{cell['sheet_name']}!{cell['cell']}"] == 0]
+        queue = [cell for cell_ref, cell in cell_lookup.items() if in_degree[cell_ref] == 0]
         batches = []
         
         # Process cells level by level (Kahn's algorithm)
         while queue:
             # All cells in current queue can be evaluated in parallel (same batch)
-            current_batch = queue[:]
+            current_batch = queue
             batches.append(current_batch)
             queue = []
             
             # Process each cell in current batch
             for cell in current_batch:
-                cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+                cell_ref = cell['ref']
                 
-                # Find cells that depend on this cell
-                for other_cell in cells_data:
-                    other_ref = f"{other_cell['sheet_name']}!{other_cell['cell']}"
-                    depends_on = other_cell.get('depends_on', [])
+                # Only the cells that depend on this cell are touched. Each
+                # edge is decremented once, so a cell reaches zero exactly
+                # once and can't be queued twice.
+                for other_cell in reverse_deps.get(cell_ref, ()):
+                    other_ref = other_cell['ref']
+                    in_degree[other_ref] -= 1
                     
-                    if cell_ref in depends_on:
-                        in_degree[other_ref] -= 1
-                        
-                        # If all dependencies are satisfied, add to next batch
-                        if in_degree[other_ref] == 0 and other_cell not in current_batch:
-                            queue.append(other_cell)
+                    # If all dependencies are satisfied, add to next batch
+                    if in_degree[other_ref] == 0:
+                        queue.append(other_cell)
         
         logger.info(f"Topological sort: {len(batches)} evaluation batches")
         for i, batch in enumerate(batches[:5]):  # Log first 5 batches
@@ -391,9 +787,9 @@ class ExcelImportService:
                     'cells': []
                 }
             
-            # Convert cell address to coordinates
+            # Coordinates are worked out once, when the cell is parsed
             try:
-                row, col = self.parser.cell_to_coordinates(cell['cell'])
+                row, col = cell['coordinates']
                 
                 # Add cell to sheet
                 if cell.get('formula') and cell['cell_type'] != 'formula_text':
@@ -435,7 +831,8 @@ class ExcelImportService:
         self,
         sheets_data: List[Dict],
         cells_to_evaluate: List[Dict],
-        cache: Dict[str, float]
+        cache: Dict[str, float],
+        cache_failures: bool = True
     ) -> Dict[str, Any]:
         """
         Batch evaluate formulas using HyperFormula.
@@ -444,6 +841,9 @@ class ExcelImportService:
             sheets_data: HyperFormula sheets structure
             cells_to_evaluate: Cells to evaluate in this batch
             cache: Dictionary to cache evaluated values
+            cache_failures: If False, a request that fails as a whole
+                (timeout, worker crash, error response) caches nothing, so
+                the cells are queried again by later calls
             
         Returns:
             Dictionary mapping cell_ref to evaluated value/error
@@ -459,14 +859,14 @@ class ExcelImportService:
         # Build queries for this batch
         queries = []
         for cell in cells_to_evaluate:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+            cell_ref = cell['ref']
             
             # Skip if already cached
             if cell_ref in cache:
                 continue
             
             try:
-                row, col = self.parser.cell_to_coordinates(cell['cell'])
+                row, col = cell['coordinates']
                 queries.append({
                     'sheet': cell['sheet_name'],
                     'row': row,
@@ -487,6 +887,9 @@ class ExcelImportService:
         
         if not result.get('success'):
             logger.error(f"HyperFormula batch evaluation failed: {result.get('error')}")
+            if not cache_failures:
+                return cache
+            
             # Return None for all cells in batch
             for query in queries:
                 cache[query['cell']] = None
@@ -522,11 +925,20 @@ class ExcelImportService:
         return cache
     
     def compute_file_hash(self, file_path: str) -> str:
-        """Compute SHA256 hash of file."""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+        """
+        Compute SHA256 hash of file.
+        
+        On Python 3.11+ hashlib.file_digest runs the read loop in C. Older
+        interpreters read into one reusable HASH_BLOCK_SIZE buffer instead.
+        """
+        with open(file_path, "rb", buffering=0) as f:
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            
+            sha256_hash = hashlib.sha256()
+            buffer = memoryview(bytearray(HASH_BLOCK_SIZE))
+            while n := f.readinto(buffer):
+                sha256_hash.update(buffer[:n])
         return sha256_hash.hexdigest()
     
     def check_duplicate(self, file_hash: str) -> Optional[int]:
@@ -560,76 +972,111 @@ class ExcelImportService:
         """
         logger.info(f"Parsing workbook: {file_path}")
         
-        # Load twice: once for formulas, once for computed values
+        # Load twice: once for formulas, once for computed values. Styles
+        # and validations come from the formula workbook, so the values
+        # workbook is only streamed row by row and can be read-only. Its
+        # sheets are read lazily, and only from their first formula row.
         wb_formulas = openpyxl.load_workbook(file_path, data_only=False)
-        wb_values = openpyxl.load_workbook(file_path, data_only=True)
+        wb_values = openpyxl.load_workbook(file_path, data_only=True, read_only=True)
         
         workbook_data = {
             'sheets': [],
             'cells': []
         }
         
-        total_sheets = len(wb_formulas.sheetnames)
-        
-        for sheet_idx, sheet_name in enumerate(wb_formulas.sheetnames):
-            ws_formulas = wb_formulas[sheet_name]
-            ws_values = wb_values[sheet_name]
-            
-            # Calculate progress within parsing phase (10-30%)
-            sheet_progress = 10 + (20 * (sheet_idx / total_sheets))
-            self._emit_progress('parsing', sheet_progress, f"Processing sheet: {sheet_name}")
-            
-            logger.info(f"Processing sheet: {sheet_name}")
-            
-            sheet_info = {
-                'name': sheet_name,
-                'max_row': ws_formulas.max_row,
-                'max_column': ws_formulas.max_column
-            }
-            workbook_data['sheets'].append(sheet_info)
+        # Read-only workbooks keep the file open until closed
+        try:
+            total_sheets = len(wb_formulas.sheetnames)
             
-            # Extract data validations (dropdowns)
-            dropdown_cells = []
-            if hasattr(ws_formulas, 'data_validations'):
-                for dv in ws_formulas.data_validations.dataValidation:
-                    if dv.type == 'list':
+            for sheet_idx, sheet_name in enumerate(wb_formulas.sheetnames):
+                ws_formulas = wb_formulas[sheet_name]
+                ws_values = wb_values[sheet_name]
+                
+                # Calculate progress within parsing phase (10-30%)
+                sheet_progress = 10 + (20 * (sheet_idx / total_sheets))
+                self._emit_progress('parsing', sheet_progress, f"Processing sheet: {sheet_name}")
+                
+                logger.info(f"Processing sheet: {sheet_name}")
+                
+                sheet_info = {
+                    'name': sheet_name,
+                    'max_row': ws_formulas.max_row,
+                    'max_column': ws_formulas.max_column
+                }
+                workbook_data['sheets'].append(sheet_info)
+                
+                # Extract data validations (dropdowns) and map each cell in the
+                # used range to the first validation covering it, so cells look
+                # their validation up instead of scanning every range
+                dropdown_cells = []
+                validations: Dict[str, Tuple[str, Optional[str]]] = {}
+                if hasattr(ws_formulas, 'data_validations'):
+                    for dv in ws_formulas.data_validations.dataValidation:
                         for cell_range in dv.cells:
-                            dropdown_cells.append(f"{sheet_name}!{cell_range}")
-            
-            if dropdown_cells:
-                self.stats['dropdown_cells'].extend(dropdown_cells)
-            
-            # Iterate through all cells in used range
-            for row_idx, row in enumerate(ws_formulas.iter_rows(
-                min_row=1, max_row=ws_formulas.max_row,
-                min_col=1, max_col=ws_formulas.max_column
-            ), 1):
-                for cell in row:
-                    if cell.value is None and not cell.data_type == 'f':
-                        continue  # Skip empty cells
-                    
-                    # Get corresponding value cell
-                    value_cell = ws_values.cell(row=cell.row, column=cell.column)
+                            if dv.type == 'list':
+                                dropdown_cells.append(f"{sheet_name}!{cell_range}")
+                            
+                            # Whole-column ranges are clipped to the used range
+                            for col in range(cell_range.min_col, min(cell_range.max_col, ws_formulas.max_column) + 1):
+                                col_letter = get_column_letter(col)
+                                for row in range(cell_range.min_row, min(cell_range.max_row, ws_formulas.max_row) + 1):
+                                    validations.setdefault(f"{col_letter}{row}", (dv.type, dv.formula1))
+                
+                if dropdown_cells:
+                    self.stats['dropdown_cells'].extend(dropdown_cells)
+                
+                # Iterate through all cells in used range, pairing each cell with
+                # its computed value by position. A constant's computed value is
+                # the constant itself, so rows are paired with themselves until
+                # the first row with a formula, and the values sheet is only
+                # read from there on; a sheet without formulas never has its
+                # values XML parsed. The read-only sheet can end before the
+                # last rows of the used range, so it is padded with empty rows.
+                used_range = {
+                    'min_row': 1, 'max_row': ws_formulas.max_row,
+                    'min_col': 1, 'max_col': ws_formulas.max_column
+                }
+                value_rows = None
+                for row_num, row in enumerate(ws_formulas.iter_rows(**used_range), start=1):
+                    if value_rows is None and any(cell.data_type == 'f' for cell in row):
+                        value_rows = chain(
+                            ws_values.iter_rows(**dict(used_range, min_row=row_num)),
+                            repeat((EMPTY_CELL,) * ws_formulas.max_column)
+                        )
+                    value_row = row if value_rows is None else next(value_rows)
                     
-                    cell_data = self.extract_cell_data(cell, value_cell, sheet_name, ws_formulas)
-                    if cell_data:
-                        workbook_data['cells'].append(cell_data)
-                        self.stats['total_cells'] += 1
+                    for cell, value_cell in zip(row, value_row):
+                        if cell.value is None and not cell.data_type == 'f':
+                            continue  # Skip empty cells
+                        
+                        cell_data = self.extract_cell_data(cell, value_cell, sheet_name, validations)
+                        if cell_data:
+                            workbook_data['cells'].append(cell_data)
+                            self.stats['total_cells'] += 1
+        finally:
+            wb_values.close()
         
         logger.info(f"Parsed {len(workbook_data['sheets'])} sheets, "
                    f"{self.stats['total_cells']} cells")
         
         return workbook_data
     
-    def extract_cell_data(self, cell_formula, cell_value, sheet_name: str, worksheet) -> Optional[Dict]:
+    def extract_cell_data(
+        self,
+        cell_formula,
+        cell_value,
+        sheet_name: str,
+        validations: Dict[str, Tuple[str, Optional[str]]]
+    ) -> Optional[Dict]:
         """
         Extract all data from a single cell.
         
         Args:
             cell_formula: Cell from workbook loaded with data_only=False (has formulas)
-            cell_value: Cell from workbook loaded with data_only=True (has computed values)
+            cell_value: Cell from workbook loaded with data_only=True (has computed values);
+                for cells without formulas this may be cell_formula itself
             sheet_name: Name of the worksheet
-            worksheet: Worksheet object for validation extraction
+            validations: Sheet's data validations as (type, formula1) by cell address
         """
         row_num = cell_formula.row
         col_letter = get_column_letter(cell_formula.column)
@@ -659,36 +1106,36 @@ class ExcelImportService:
         # Get raw value from the data_only=True workbook (Excel's computed value)
         raw_value = None
         raw_text = None
+        value = cell_value.value
+        
+        # Infer data type from the computed value with one dict lookup on
+        # the exact type; subclasses fall back to isinstance checks
+        data_type = VALUE_DATA_TYPES.get(type(value))
+        if data_type is None:
+            data_type = 'text'
+            if isinstance(value, (int, float)):
+                data_type = 'number'
+            elif isinstance(value, datetime):
+                data_type = 'date'
         
-        if cell_value.value is not None:
+        if value is not None:
             try:
                 # Try to convert to float
-                if isinstance(cell_value.value, (int, float)):
-                    raw_value = float(cell_value.value)
-                elif isinstance(cell_value.value, str):
+                if data_type == 'number':
+                    raw_value = float(value)
+                elif isinstance(value, str):
                     # Try to parse string as number
                     try:
-                        raw_value = float(cell_value.value)
+                        raw_value = float(value)
                     except ValueError:
                         # It's actually a text value - store in raw_text
-                        raw_text = cell_value.value
+                        raw_text = value
                         logger.debug(f"Cell {cell_address} has text value: {raw_text}")
                 else:
-                    logger.debug(f"Cell {cell_address} has non-numeric value type: {type(cell_value.value)}")
+                    logger.debug(f"Cell {cell_address} has non-numeric value type: {type(value)}")
             except (ValueError, TypeError) as e:
                 logger.debug(f"Could not convert value for {cell_address}: {e}")
         
-        # Infer data type from the computed value
-        data_type = 'text'
-        if isinstance(cell_value.value, (int, float)):
-            data_type = 'number'
-        elif isinstance(cell_value.value, bool):
-            data_type = 'boolean'
-        elif isinstance(cell_value.value, datetime):
-            data_type = 'date'
-        elif isinstance(cell_value.value, str):
-            data_type = 'text'
-        
         # Extract dependencies
         depends_on = []
         if formula:
@@ -699,25 +1146,22 @@ class ExcelImportService:
         validation_type = None
         validation_options = []
         
-        cell_coord = cell_formula.coordinate
-        if hasattr(worksheet, 'data_validations'):
-            for dv in worksheet.data_validations.dataValidation:
-                if cell_coord in dv.cells:
-                    has_validation = True
-                    validation_type = dv.type
-                    if dv.formula1:
-                        # Try to extract list values
-                        try:
-                            if dv.formula1.startswith('"'):
-                                # Quoted list: "Option1,Option2,Option3"
-                                options_str = dv.formula1.strip('"')
-                                validation_options = [opt.strip() for opt in options_str.split(',')]
-                            else:
-                                # Range reference
-                                validation_options = [dv.formula1]
-                        except:
-                            pass
-                    break
+        validation = validations.get(cell_address)
+        if validation:
+            has_validation = True
+            validation_type, formula1 = validation
+            if formula1:
+                # Try to extract list values
+                try:
+                    if formula1.startswith('"'):
+                        # Quoted list: "Option1,Option2,Option3"
+                        options_str = formula1.strip('"')
+                        validation_options = [opt.strip() for opt in options_str.split(',')]
+                    else:
+                        # Range reference
+                        validation_options = [formula1]
+                except:
+                    pass
         
         # Extract style information
         style = {}
@@ -746,6 +1190,9 @@ class ExcelImportService:
         cell_data = {
             'sheet_name': sheet_name,
             'cell': cell_address,
+            'ref': f"{sheet_name}!{cell_address}",
+            # Zero-based (row, col) as HyperFormula addresses cells
+            'coordinates': (row_num - 1, cell_formula.column - 1),
             'row_num': row_num,
             'col_letter': col_letter,
             'cell_type': cell_type,
@@ -817,16 +1264,14 @@ class ExcelImportService:
             self._emit_progress('dependencies', 30, 'Building dependency graph...')
             logger.info("Building dependency graph...")
             for cell_data in workbook_data['cells']:
-                cell_ref = f"{cell_data['sheet_name']}!{cell_data['cell']}"
-                self.circular_detector.add_dependency(cell_ref, cell_data['depends_on'])
+                self.circular_detector.add_dependency(cell_data['ref'], cell_data['depends_on'])
             
             circular_groups = self.circular_detector.detect_cycles()
             self.stats['circular_references'] = sum(len(group) for group in circular_groups)
             
             # Mark circular cells
             for cell_data in workbook_data['cells']:
-                cell_ref = f"{cell_data['sheet_name']}!{cell_data['cell']}"
-                cell_data['is_circular'] = self.circular_detector.is_circular(cell_ref)
+                cell_data['is_circular'] = self.circular_detector.is_circular(cell_data['ref'])
             
             # Step 5: Create model record (37%)
             self._emit_progress('creating_model', 37, 'Creating model record...')
@@ -911,6 +1356,10 @@ class ExcelImportService:
                 'errors': errors,
                 'duplicate': False
             }
+        finally:
+            # All formulas are evaluated by now; don't leave the worker
+            # running between imports
+            self.close()
     
     def evaluate_formulas(self, cells_data: List[Dict]):
         """
@@ -932,8 +1381,7 @@ class ExcelImportService:
         # Build lookup for quick access
         cell_lookup = {}
         for cell in cells_data:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
-            cell_lookup[cell_ref] = cell
+            cell_lookup[cell['ref']] = cell
         
         # Separate circular from non-circular
         circular_cells = []
@@ -953,6 +1401,19 @@ class ExcelImportService:
         self._emit_progress('evaluation', 42, 'Sorting formulas by dependencies...')
         evaluation_batches = self._topological_sort_formulas(non_circular_cells)
         
+        # Once its sheets are loaded HyperFormula resolves dependencies
+        # itself, so its results don't depend on the order cells are asked
+        # for. Every non-circular numeric formula is queried in one request
+        # here; the batches below then find their results in the cache. If
+        # this request fails nothing is cached, and each batch falls back
+        # to querying its own cells, so one failure can't null every formula.
+        self._batch_evaluate_hyperformula(
+            sheets_data,
+            [cell for cell in non_circular_cells if cell['cell_type'] != 'formula_text'],
+            cache,
+            cache_failures=False
+        )
+        
         # Evaluate non-circular formulas in dependency order (45-70%)
         total_batches = len(evaluation_batches)
         evaluated = 0
@@ -1023,7 +1484,7 @@ class ExcelImportService:
                         cell['mismatch_diff'] = float(abs(len(result_text) - len(cell['raw_text'])))
                         self.stats['mismatches'] += 1
             except Exception as e:
-                logger.error(f"Text formula evaluation failed for {cell['sheet_name']}!{cell['cell']}: {e}")
+                logger.error(f"Text formula evaluation failed for {cell['ref']}: {e}")
                 cell['calculated_text'] = None
                 self.stats['errors'] += 1
         
@@ -1033,7 +1494,7 @@ class ExcelImportService:
             
             # Apply results to cells
             for cell in numeric_formulas:
-                cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+                cell_ref = cell['ref']
                 result_value = cache.get(cell_ref)
                 
                 # Classify engine type
@@ -1088,7 +1549,7 @@ class ExcelImportService:
             Evaluated numeric value or None on error
         """
         formula = cell.get('formula', '')
-        cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+        cell_ref = cell['ref']
         
         # Check cache first
         if cell_ref in cache:
@@ -1102,7 +1563,7 @@ class ExcelImportService:
         
         # Evaluate through HyperFormula
         try:
-            row, col = self.parser.cell_to_coordinates(cell['cell'])
+            row, col = cell['coordinates']
             
             result = self.hf_evaluator.evaluate_batch(
                 sheets_data=sheets_data,
@@ -1157,8 +1618,8 @@ class ExcelImportService:
         queries = []
         for cell in circular_cells:
             try:
-                row, col = self.parser.cell_to_coordinates(cell['cell'])
-                cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+                row, col = cell['coordinates']
+                cell_ref = cell['ref']
                 queries.append({
                     'sheet': cell['sheet_name'],
                     'row': row,
@@ -1205,7 +1666,7 @@ class ExcelImportService:
         
         # Apply results to cells
         for cell in circular_cells:
-            cell_ref = f"{cell['sheet_name']}!{cell['cell']}"
+            cell_ref = cell['ref']
             result_value = values.get(cell_ref)
             
             # Circular cells that HyperFormula can't evaluate are marked as 'custom'
@@ -1248,35 +1709,56 @@ class ExcelImportService:
     
     
     def bulk_insert_cells(self, model_id: int, cells_data: List[Dict]):
-        """Bulk insert cells in batches."""
+        """
+        Bulk insert cells in batches.
+        
+        Cells go straight to the database connection with COPY, outside the
+        ORM unit of work, so the session never tracks them. Autoflush is
+        held off while the batches run and the whole insert uses a single
+        cursor; the caller commits once at the end.
+        """
         BATCH_SIZE = 1000
         total_cells = len(cells_data)
         
-        for i in range(0, total_cells, BATCH_SIZE):
-            batch = cells_data[i:i + BATCH_SIZE]
-            cell_objects = []
-            
-            # Update progress
-            progress = 80 + (15 * (i / max(total_cells, 1)))
-            self._emit_progress('insertion', progress, 
-                              f"Inserting cells {i}/{total_cells}")
-            
-            for cell_data in batch:
-                cell_obj = Cell(
-                    model_id=model_id,
-                    **{k: v for k, v in cell_data.items() if k in [
-                        'sheet_name', 'cell', 'row_num', 'col_letter', 'cell_type',
-                        'raw_value', 'raw_text', 'formula', 'data_type', 'depends_on', 'is_circular',
-                        'has_validation', 'validation_type', 'validation_options',
-                        'style', 'calculation_engine', 'converted_formula',
-                        'calculated_value', 'calculated_text', 'has_mismatch', 'mismatch_diff'
-                    ]}
-                )
-                cell_objects.append(cell_obj)
-            
-            self.session.bulk_save_objects(cell_objects)
-            self.session.flush()
-            
-            logger.debug(f"Inserted batch {i//BATCH_SIZE + 1} ({len(batch)} cells)")
+        with self.session.no_autoflush:
+            cursor = self.session.connection().connection.cursor()
+            try:
+                for i in range(0, total_cells, BATCH_SIZE):
+                    batch = cells_data[i:i + BATCH_SIZE]
+                    
+                    # Update progress
+                    progress = 80 + (15 * (i / max(total_cells, 1)))
+                    self._emit_progress('insertion', progress, 
+                                      f"Inserting cells {i}/{total_cells}")
+                    
+                    self._copy_insert_cells(cursor, model_id, batch)
+                    
+                    logger.debug(f"Inserted batch {i//BATCH_SIZE + 1} ({len(batch)} cells)")
+            finally:
+                cursor.close()
         
-        logger.info(f"Inserted {len(cells_data)} cells")
\ No newline at end of file
+        logger.info(f"Inserted {len(cells_data)} cells")
+    
+    def _copy_insert_cells(self, cursor, model_id: int, cells_data: List[Dict]):
+        """
+        Insert cells with PostgreSQL COPY.
+        
+        Rows are written to an in-memory buffer in COPY text format and
+        streamed through the given DBAPI cursor on the session's own
+        connection, so they share the transaction that created the model
+        row and skip both the ORM and per-statement parsing on the server.
+        """
+        # model_id leads every row; the remaining columns come from the cell
+        # dict, falling back to the NOT NULL defaults
+        row_prefix = format_copy_field(model_id) + '\t'
+        
+        buffer = io.StringIO()
+        for cell_data in cells_data:
+            buffer.write(row_prefix)
+            buffer.write('\t'.join(
+                format_copy_field(cell_data.get(col, default)) for col, default in CELL_COPY_FIELDS
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        cursor.copy_expert(CELL_COPY_SQL, buffer)
\ No newline at end of file
@@ -74,6 +74,18 @@ class TestCircularReferenceDetector:
         assert len(cycles) == 1
         assert set(cycles[0]) == {'A1', 'B1', 'C1'}
     
+    def test_detect_self_reference(self):
+        """Test that a cell referring to itself is a cycle on its own."""
+        detector = CircularReferenceDetector()
+        
+        detector.add_dependency('A1', ['A1'])
+        detector.add_dependency('B1', ['A1'])
+        
+        cycles = detector.detect_cycles()
+        assert cycles == [['A1']]
+        assert detector.is_circular('A1')
+        assert not detector.is_circular('B1')
+    
     def test_no_cycle(self):
         """Test that non-circular dependencies don't create cycles."""
         detector = CircularReferenceDetector()
@@ -86,6 +98,46 @@ class TestCircularReferenceDetector:
         assert len(cycles) == 0
 
 
+class TestTopologicalSort:
+    """Test dependency ordering of non-circular formulas."""
+    
+    def test_batches_follow_dependencies(self):
+        """Test that each cell lands one batch after its last dependency."""
+        importer = ExcelImportService(None)
+        
+        def formula_cell(cell, depends_on):
+            return {
+                'sheet_name': 'Sheet1',
+                'cell': cell,
+                'ref': f'Sheet1!{cell}',
+                'depends_on': depends_on
+            }
+        
+        cells = [
+            formula_cell('D1', ['Sheet1!B1', 'Sheet1!C1']),
+            formula_cell('B1', ['Sheet1!A1', 'Sheet1!Z9']),
+            formula_cell('C1', ['Sheet1!A1', 'Sheet1!B1']),
+            formula_cell('A1', []),
+        ]
+        
+        batches = importer._topological_sort_formulas(cells)
+        
+        assert [[c['cell'] for c in batch] for batch in batches] == [
+            ['A1'], ['B1'], ['C1'], ['D1']
+        ]
+    
+    def test_independent_formulas_form_one_batch(self):
+        """Test that formulas with no formula dependencies are one batch."""
+        importer = ExcelImportService(None)
+        
+        cells = [
+            {'sheet_name': 'Sheet1', 'cell': 'B1', 'ref': 'Sheet1!B1', 'depends_on': ['Sheet1!A1']},
+            {'sheet_name': 'Sheet1', 'cell': 'B2', 'ref': 'Sheet1!B2', 'depends_on': []},
+        ]
+        
+        assert importer._topological_sort_formulas(cells) == [cells]
+
+
 class TestCircularSolver:
     """Test iterative solver for circular references."""
     
@@ -124,6 +176,71 @@ class TestCircularSolver:
         assert abs(results['Sheet1!A1'] - 2.0) < 1e-5
         assert abs(results['Sheet1!B1'] - 1.0) < 1e-5
     
+    def test_convergence_at_large_magnitudes(self):
+        """Test that loops with large values converge on relative change."""
+        solver = CircularSolver(max_iterations=100, threshold=1e-6)
+        
+        def mock_evaluate(cell_ref, values):
+            # A1 = B1 + 1e9, B1 = A1 / 2; solution A1 = 2e9, B1 = 1e9
+            if cell_ref == 'Sheet1!A1':
+                return values['Sheet1!B1'] + 1e9
+            return values['Sheet1!A1'] / 2
+        
+        results, status, iterations = solver.solve(
+            ['Sheet1!A1', 'Sheet1!B1'], {}, mock_evaluate
+        )
+        
+        assert status == 'converged'
+        assert iterations < 100
+        assert abs(results['Sheet1!A1'] / 2e9 - 1) < 1e-5
+    
+    def test_aitken_acceleration(self):
+        """Test that extrapolation speeds up a slowly converging loop."""
+        def mock_evaluate(cell_ref, values):
+            # A1 = 0.97 * A1 + 3, solution A1 = 100
+            return 0.97 * values['Sheet1!A1'] + 3
+        
+        plain = CircularSolver(max_iterations=1000, threshold=1e-6, accelerate=False)
+        accelerated = CircularSolver(max_iterations=1000, threshold=1e-6)
+        
+        _, _, plain_iterations = plain.solve(['Sheet1!A1'], {}, mock_evaluate)
+        results, status, iterations = accelerated.solve(['Sheet1!A1'], {}, mock_evaluate)
+        
+        assert status == 'converged'
+        assert iterations < plain_iterations / 10
+        assert abs(results['Sheet1!A1'] - 100.0) < 1e-6
+    
+    def test_max_iterations_returns_evaluated_values(self):
+        """Test that hitting max_iterations never returns an extrapolation."""
+        def mock_evaluate(cell_ref, values):
+            # A1 = 0.99 * A1 + 1; sweeps from 0 give 1, 1.99, 2.9701
+            return 0.99 * values['Sheet1!A1'] + 1
+        
+        solver = CircularSolver(max_iterations=3, threshold=1e-12)
+        
+        results, status, iterations = solver.solve(['Sheet1!A1'], {}, mock_evaluate)
+        
+        assert status == 'max_iterations'
+        assert iterations == 3
+        assert abs(results['Sheet1!A1'] - 2.9701) < 1e-9
+        
+    def test_over_relaxation(self):
+        """Test that over-relaxation speeds up a monotone loop."""
+        def mock_evaluate(cell_ref, values):
+            # A1 = 0.97 * A1 + 3, solution A1 = 100
+            return 0.97 * values['Sheet1!A1'] + 3
+        
+        plain = CircularSolver(max_iterations=1000, threshold=1e-9, accelerate=False)
+        relaxed = CircularSolver(max_iterations=1000, threshold=1e-9, accelerate=False,
+                                 relaxation=1.5)
+        
+        _, _, plain_iterations = plain.solve(['Sheet1!A1'], {}, mock_evaluate)
+        results, status, iterations = relaxed.solve(['Sheet1!A1'], {}, mock_evaluate)
+        
+        assert status == 'converged'
+        assert iterations < plain_iterations
+        assert abs(results['Sheet1!A1'] - 100.0) < 1e-3
+    
     def test_no_raw_value_copying(self, mock_circular_cells):
         """CRITICAL: Ensure raw_value is never copied to calculated_value."""
         solver = CircularSolver()
@@ -197,6 +314,48 @@ class TestHyperFormulaEvaluator:
             assert result['results'][0]['value'] == 15
         else:
             pytest.skip(f"HyperFormula evaluation failed: {result.get('error')}")
+    
+    @pytest.mark.skipif(
+        not Path('scripts/hyperformula_wrapper.js').exists(),
+        reason="HyperFormula wrapper not found"
+    )
+    def test_recovers_after_failed_query(self):
+        """Test that a rejected query doesn't break later queries."""
+        evaluator = HyperFormulaEvaluator()
+        query = {'sheet': 'Sheet1', 'row': 2, 'col': 0, 'cell': 'A3'}
+        
+        try:
+            result = evaluator.evaluate_batch(
+                sheets_data=[{
+                    'name': 'Sheet1',
+                    'cells': [
+                        {'row': 0, 'col': 0, 'value': 5},
+                        {'row': 1, 'col': 0, 'value': 10},
+                        {'row': 2, 'col': 0, 'formula': '=A1+A2'}
+                    ]
+                }],
+                queries=[query]
+            )
+            if not result.get('success'):
+                pytest.skip(f"HyperFormula evaluation failed: {result.get('error')}")
+            
+            # Not a list, so the worker rejects the request
+            assert evaluator.query(None)['success'] is False
+            
+            result = evaluator.query([query])
+            assert result['success'] is True
+            assert result['results'][0]['value'] == 15
+        finally:
+            evaluator.close()
+    
+    def test_query_without_sheets(self):
+        """Test that querying before any sheets are loaded fails cleanly."""
+        evaluator = HyperFormulaEvaluator()
+        
+        result = evaluator.query([{'sheet': 'Sheet1', 'row': 0, 'col': 0, 'cell': 'A1'}])
+        
+        assert result['success'] is False
+        assert evaluator.process is None
 
 
 class TestExcelImporter:
@@ -265,12 +424,7 @@ class TestExcelImporter:
                 self.border = None
                 self.fill = None
         
-        class MockWorksheet:
-            data_validations = type('obj', (object,), {
-                'dataValidation': []
-            })
-        
-        cell_data = importer.extract_cell_data(MockCell(), 'Sheet1', MockWorksheet())
+        cell_data = importer.extract_cell_data(MockCell(), MockCell(), 'Sheet1', {})
         
         assert cell_data is not None
         assert cell_data['cell_type'] == 'formula_text'